@@ -0,0 +1,214 @@
+from manim import *
+from pathlib import Path
+import errno
+import hashlib
+import os
+import shutil
+import uuid
+from svg_hooks import add_svg_hooks
+
+# Root of the shared store; render.py --asset-store sets it, and worker
+# processes and daemon renders inherit it from the environment
+ASSET_STORE_ENV = "MANIM_ASSET_STORE"
+
+# ioctl request that clones a file's extents on Linux (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def reflink(source, target):
+    import fcntl
+
+    with open(source, "rb") as source_file, open(target, "wb") as target_file:
+        fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+
+
+class AssetStore:
+    """Content-addressed store for Tex SVGs, Text SVGs and partial movies.
+
+    Files live once under ``objects/<sha256[:2]>/<sha256>``; ``keys/<kind>/``
+    maps the name manim looks a file up by (the SVG or partial movie file
+    name, plus the resolution for movies) to its digest. Every write goes
+    to a unique temporary file that is moved into place, so any number of
+    workers, checkouts and CI jobs can share one root. Reads check the
+    digest and drop corrupted objects along with their key. ``materialize`` places a stored file
+    where manim expects it as a hard link (``link=True``), a reflink or a
+    copy; files manim rewrites in place are never hard-linked.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root).expanduser().resolve()
+        self.temp_dir = self.root / "tmp"
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        # Digests already checked by this process
+        self.verified = set()
+
+    def object_file(self, digest):
+        return self.root / "objects" / digest[:2] / digest
+
+    def key_file(self, kind, key):
+        return self.root / "keys" / kind / hashlib.sha256(key.encode()).hexdigest()
+
+    def temp_file(self):
+        return self.temp_dir / f"{os.getpid()}_{uuid.uuid4().hex}.tmp"
+
+    def write_atomic(self, target, write):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.temp_file()
+        try:
+            write(temp_file)
+            os.replace(temp_file, target)
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+
+    def lookup(self, kind, key):
+        # Digest of a verified object stored under ``key``, or None
+        try:
+            digest = self.key_file(kind, key).read_text().strip()
+        except OSError:
+            return None
+        object_file = self.object_file(digest)
+        if digest in self.verified:
+            return digest if object_file.exists() else None
+        try:
+            valid = file_digest(object_file) == digest
+        except OSError:
+            return None
+        if not valid:
+            logger.warning(f"Dropping corrupted asset {object_file}")
+            object_file.unlink(missing_ok=True)
+            self.key_file(kind, key).unlink(missing_ok=True)
+            return None
+        self.verified.add(digest)
+        return digest
+
+    def contains(self, kind, key):
+        # Other keys of a dropped object still point at it, so the object
+        # has to be there as well
+        try:
+            digest = self.key_file(kind, key).read_text().strip()
+        except OSError:
+            return False
+        return self.object_file(digest).exists()
+
+    def put(self, kind, key, path):
+        # Store the file at ``path`` under ``key``; returns its digest
+        digest = file_digest(path)
+        object_file = self.object_file(digest)
+        if not object_file.exists():
+            self.write_atomic(object_file, lambda temp_file: shutil.copyfile(path, temp_file))
+        self.write_atomic(self.key_file(kind, key), lambda temp_file: temp_file.write_text(digest))
+        self.verified.add(digest)
+        return digest
+
+    def materialize(self, kind, key, path, link=True):
+        # Place the stored file for ``key`` at ``path``; False on a miss
+        digest = self.lookup(kind, key)
+        if digest is None:
+            return False
+        object_file = self.object_file(digest)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = path.with_name(f"{path.name}_{os.getpid()}_{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            try:
+                if not link:
+                    raise OSError(errno.EPERM, "hard links disabled")
+                os.link(object_file, temp_file)
+            except OSError:
+                try:
+                    reflink(object_file, temp_file)
+                except (ImportError, OSError):
+                    shutil.copyfile(object_file, temp_file)
+            os.replace(temp_file, path)
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+        return True
+
+
+active_stores = {}
+
+
+def active_store():
+    # The store configured in the environment, or None
+    root = os.environ.get(ASSET_STORE_ENV)
+    if not root:
+        return None
+    if root not in active_stores:
+        active_stores[root] = AssetStore(root)
+    return active_stores[root]
+
+
+def fetch_asset(kind, path, key=None, link=True):
+    # Materialize ``path`` from the store; False without a store or on a miss
+    store = active_store()
+    if store is None:
+        return False
+    return store.materialize(kind, key or Path(path).name, path, link=link)
+
+
+def publish_asset(kind, path, key=None):
+    # Add an existing ``path`` to the store unless it already has the key
+    store = active_store()
+    key = key or Path(path).name
+    if store is None or store.contains(kind, key) or not Path(path).exists():
+        return
+    store.put(kind, key, path)
+
+
+def movie_key(file_name):
+    # Partial movie hashes do not cover the resolution and frame rate
+    return f"{config['pixel_width']}x{config['pixel_height']}@{config['frame_rate']}/{file_name}"
+
+
+class AssetStoreWriter:
+    """File writer mixin that shares partial movies through the asset store.
+
+    A play missing from the partial movie directory is looked up in the
+    store before it is rendered, and every partial movie written is added to
+    it. Movies are hard-linked, so an existing file is removed before a
+    movie is written in its place rather than overwritten through the link.
+    """
+
+    def is_already_cached(self, hash_invocation):
+        if super().is_already_cached(hash_invocation):
+            return True
+        file_name = f"{hash_invocation}{config['movie_file_extension']}"
+        if not fetch_asset("movie", self.partial_movie_directory / file_name, key=movie_key(file_name)):
+            return False
+        return super().is_already_cached(hash_invocation)
+
+    def open_movie_pipe(self, file_path=None):
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        Path(file_path).unlink(missing_ok=True)
+        super().open_movie_pipe(file_path=file_path)
+
+    def close_movie_pipe(self):
+        super().close_movie_pipe()
+        # The ffmpeg process of this movie; PyAV raises on its own errors
+        process = None if getattr(self, "uses_av", lambda: False)() else getattr(self, "writing_process", None)
+        file_path = Path(self.partial_movie_files[self.renderer.num_plays])
+        if process is not None and process.returncode != 0:
+            logger.warning(f"ffmpeg exited with code {process.returncode}, not adding {file_path.name} to the asset store")
+            return
+        publish_asset("movie", file_path, key=movie_key(file_path.name))
+
+
+def fetch_svg(kind, svg_file):
+    # A Tex SVG's file name hashes the whole .tex document, template
+    # included. Text rewrites its SVG in place after Pango writes it, so it
+    # is copied rather than linked.
+    fetch_asset(kind, svg_file, link=kind != "text")
+
+
+add_svg_hooks(before=fetch_svg, after=publish_asset)
@@ -0,0 +1,82 @@
+from manim import *
+from manim import __version__
+from manim.utils.file_ops import is_mp4_format
+from fractions import Fraction
+
+try:
+    import av
+
+    av_imported = True
+except ImportError:
+    av_imported = False
+
+
+class AVSceneFileWriter(SceneFileWriter):
+    """SceneFileWriter that encodes partial movies in-process through PyAV.
+
+    Frames go straight from the camera's pixel array into libav's encoder
+    instead of being piped as raw RGBA into an ffmpeg subprocess, and no
+    process is spawned per ``self.play``. Anything this backend does not
+    cover (OpenGL, gif, webm, transparent movies, missing PyAV) falls back
+    to the ffmpeg pipe.
+    """
+
+    codec = "libx264"
+    pix_fmt = "yuv420p"
+
+    def uses_av(self):
+        return (
+            av_imported
+            and config.renderer == RendererType.CAIRO
+            and is_mp4_format()
+            and not config["transparent"]
+        )
+
+    def open_movie_pipe(self, file_path=None):
+        if not self.uses_av():
+            return super().open_movie_pipe(file_path=file_path)
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+
+        rate = Fraction(config["frame_rate"]).limit_denominator(1001)
+        self.av_container = av.open(str(file_path), mode="w")
+        self.av_container.metadata["comment"] = f"Rendered with Manim Community v{__version__}"
+        stream = self.av_container.add_stream(self.codec, rate=rate)
+        stream.width = config["pixel_width"]
+        stream.height = config["pixel_height"]
+        stream.pix_fmt = self.pix_fmt
+        self.av_stream = stream
+        self.av_time_base = 1 / rate
+        self.av_frame_index = 0
+
+    def encode_av_frame(self, frame):
+        frame.pts = self.av_frame_index
+        frame.time_base = self.av_time_base
+        self.av_frame_index += 1
+        self.av_container.mux(self.av_stream.encode(frame))
+
+    def write_frame(self, frame_or_renderer):
+        if getattr(self, "av_container", None) is None:
+            return super().write_frame(frame_or_renderer)
+        self.encode_av_frame(av.VideoFrame.from_ndarray(frame_or_renderer, format="rgba"))
+
+    def write_repeated_frame(self, frame, num_frames):
+        # Convert the frame once and let the encoder repeat it
+        frame = av.VideoFrame.from_ndarray(frame, format="rgba").reformat(format=self.pix_fmt)
+        for _ in range(num_frames):
+            self.encode_av_frame(frame)
+
+    def close_movie_pipe(self):
+        if getattr(self, "av_container", None) is None:
+            return super().close_movie_pipe()
+        # Flush the frames still buffered in the encoder
+        self.av_container.mux(self.av_stream.encode(None))
+        self.av_container.close()
+        self.av_container = None
+        self.av_stream = None
+
+        logger.info(
+            f"Animation {self.renderer.num_plays} : Partial movie file written in %(path)s",
+            {"path": f"'{self.partial_movie_file_path}'"},
+        )
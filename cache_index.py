@@ -0,0 +1,319 @@
+from manim import *
+from manim.utils.file_ops import write_to_movie
+from pathlib import Path
+import argparse
+import atexit
+import os
+import sqlite3
+import time
+from svg_hooks import add_svg_hooks
+
+SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    scene TEXT,
+    resolution TEXT,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE INDEX IF NOT EXISTS entries_directory ON entries (kind, scene, resolution);
+"""
+
+
+def parse_size(text):
+    # "500M", "2G", "1.5G" or a plain number of bytes
+    text = text.strip().upper().rstrip("B").rstrip("I")
+    unit = text[-1] if text and text[-1] in SIZE_UNITS else ""
+    return int(float(text[: len(text) - len(unit)]) * SIZE_UNITS[unit])
+
+
+def format_size(size):
+    for unit in ("", "K", "M", "G"):
+        if size < 1024:
+            return f"{size:.0f} {unit}B" if not unit else f"{size:.1f} {unit}iB"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def index_file():
+    return Path(config.get_dir("media_dir")) / "cache_index.sqlite"
+
+
+class CacheIndex:
+    """SQLite index of every cached partial movie, Tex SVG and Text SVG.
+
+    One row per file with its kind (``movie``, ``tex`` or ``text``), scene,
+    resolution, size, creation and last access time and hit count. The
+    database lives at ``media_dir/cache_index.sqlite`` in WAL mode with a
+    generous busy timeout, so parallel workers can record into it at the
+    same time. Cache lookups and eviction query it instead of listing the
+    cache directories. Lookups only read; their hits are kept in memory and
+    written in one transaction by ``flush``.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or index_file())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode this only gives up durability of the last commits on a
+        # power loss, not consistency, and spares an fsync per commit
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        # {path: (last access, hits)} of lookups not written yet
+        self.pending_hits = {}
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def flush(self):
+        # Write the buffered lookup hits in one transaction
+        if not self.pending_hits:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE entries SET last_access = MAX(last_access, ?), hits = hits + ? WHERE path = ?",
+                [(last_access, hits, path) for path, (last_access, hits) in self.pending_hits.items()],
+            )
+        self.pending_hits = {}
+
+    def record(self, path, kind, scene=None, resolution=None):
+        # Add or refresh the row of an existing file
+        path = Path(path).resolve()
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        now = time.time()
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO entries (path, kind, scene, resolution, size, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET size = excluded.size, last_access = excluded.last_access",
+                (str(path), kind, scene, resolution, size, now, now),
+            )
+
+    def lookup(self, path):
+        # True and one more hit if ``path`` is indexed and still on disk
+        path = Path(path).resolve()
+        row = self.connection.execute("SELECT 1 FROM entries WHERE path = ?", (str(path),)).fetchone()
+        if row is None:
+            return False
+        if not path.exists():
+            self.forget([path])
+            return False
+        hits = self.pending_hits.get(str(path), (None, 0))[1]
+        self.pending_hits[str(path)] = (time.time(), hits + 1)
+        return True
+
+    def forget(self, paths):
+        with self.connection:
+            self.connection.executemany("DELETE FROM entries WHERE path = ?", [(str(path),) for path in paths])
+
+    def evict(self, rows, dry_run=False):
+        # Delete the files of ``rows`` (path, size, ...) and their entries
+        freed = 0
+        for row in rows:
+            if not dry_run:
+                Path(row[0]).unlink(missing_ok=True)
+            freed += row[1]
+        if not dry_run:
+            self.forget(row[0] for row in rows)
+        return freed
+
+    def total_size(self):
+        self.flush()
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def prune(self, max_bytes=None, max_age=None, policy="lru", dry_run=False):
+        # Evict entries older than ``max_age`` seconds, then the least
+        # recently (lru) or least often (lfu) used ones until the index is
+        # within ``max_bytes``. Returns (files, bytes) evicted.
+        self.flush()
+        rows = []
+        if max_age is not None:
+            rows += self.connection.execute(
+                "SELECT path, size FROM entries WHERE last_access < ?", (time.time() - max_age,)
+            ).fetchall()
+        if max_bytes is not None:
+            order = "hits, last_access" if policy == "lfu" else "last_access"
+            excess = self.total_size() - sum(row[1] for row in rows) - max_bytes
+            expired = {row[0] for row in rows}
+            for row in self.connection.execute(f"SELECT path, size FROM entries ORDER BY {order}"):
+                if excess <= 0:
+                    break
+                if row[0] not in expired:
+                    rows.append(row)
+                    excess -= row[1]
+        return len(rows), self.evict(rows, dry_run=dry_run)
+
+    def trim_directory(self, directory, max_files):
+        # manim's max_files_cached, counted from the index
+        self.flush()
+        rows = self.connection.execute(
+            "SELECT path, size FROM entries WHERE kind = 'movie' AND path LIKE ? ORDER BY last_access",
+            (str(Path(directory).resolve() / "%"),),
+        ).fetchall()
+        rows = [row for row in rows if Path(row[0]).parent == Path(directory).resolve()]
+        excess = rows[: max(0, len(rows) - max_files)]
+        self.evict(excess)
+        return len(excess)
+
+    def stats(self):
+        self.flush()
+        return self.connection.execute(
+            "SELECT kind, COALESCE(scene, ''), COALESCE(resolution, ''), COUNT(*), SUM(size), "
+            "MIN(last_access), MAX(last_access), SUM(hits) "
+            "FROM entries GROUP BY kind, scene, resolution ORDER BY kind, scene, resolution"
+        ).fetchall()
+
+    def rescan(self, media_dir=None):
+        # Drop rows of deleted files and index cached files that are on disk
+        # but not in the index yet, e.g. from renders before it existed
+        media_dir = Path(media_dir or config.get_dir("media_dir")).resolve()
+        stale = [row[0] for row in self.connection.execute("SELECT path FROM entries") if not Path(row[0]).exists()]
+        self.forget(stale)
+        known = {row[0] for row in self.connection.execute("SELECT path FROM entries")}
+        added = 0
+        candidates = [(path, "tex", None, None) for path in media_dir.glob("Tex/*.svg")]
+        candidates += [(path, "text", None, None) for path in media_dir.glob("texts/*.svg")]
+        for path in media_dir.glob("videos/**/partial_movie_files/**/*"):
+            # videos/<module>/<resolution>/partial_movie_files/<scene>/...
+            parts = path.relative_to(media_dir).parts
+            if path.suffix in (".mp4", ".mov", ".webm", ".gif") and len(parts) > 4:
+                candidates.append((path, "movie", parts[4], parts[2]))
+        for path, kind, scene, resolution in candidates:
+            if str(path.resolve()) not in known:
+                self.record(path, kind, scene, resolution)
+                added += 1
+        return len(stale), added
+
+
+# One connection per process, opened on first use; a forked worker must not
+# reuse its parent's
+open_indexes = {}
+
+
+def active_index():
+    key = (os.getpid(), index_file())
+    if key not in open_indexes:
+        open_indexes[key] = CacheIndex(key[1])
+        atexit.register(open_indexes[key].flush)
+    return open_indexes[key]
+
+
+def resolution_name():
+    # Same naming as manim's quality directories, e.g. 720p30
+    return f"{config['pixel_height']}p{config['frame_rate']}"
+
+
+class IndexedCacheWriter:
+    """File writer mixin that keeps partial movies in the cache index.
+
+    A play counts as cached when the index has its partial movie (a file
+    only found on disk is indexed on the way), every partial movie written
+    is recorded, and ``clean_cache`` trims the partial movie directory to
+    ``max_files_cached`` from the index instead of listing and stat-ing it.
+    With ``cache_budget`` set (bytes), the whole index is then pruned to it,
+    least recently used first, across scenes, resolutions and Tex/Text.
+    """
+
+    cache_budget = None
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        self.scene_name = scene_name
+        super().__init__(renderer, scene_name, **kwargs)
+
+    def movie_path(self, hash_invocation):
+        return self.partial_movie_directory / f"{hash_invocation}{config['movie_file_extension']}"
+
+    def record_movie(self, path):
+        active_index().record(path, "movie", self.scene_name, resolution_name())
+
+    def is_already_cached(self, hash_invocation):
+        if not hasattr(self, "partial_movie_directory") or not write_to_movie():
+            return False
+        path = self.movie_path(hash_invocation)
+        if active_index().lookup(path) and super().is_already_cached(hash_invocation):
+            return True
+        if not super().is_already_cached(hash_invocation):
+            return False
+        self.record_movie(path)
+        return True
+
+    def close_movie_pipe(self):
+        super().close_movie_pipe()
+        self.record_movie(self.partial_movie_files[self.renderer.num_plays])
+
+    def finish(self):
+        super().finish()
+        # Worker processes may exit without running atexit
+        active_index().flush()
+
+    def clean_cache(self):
+        removed = active_index().trim_directory(self.partial_movie_directory, config["max_files_cached"])
+        if removed:
+            logger.info(
+                f"The partial movie directory is full (> {config['max_files_cached']} files). "
+                f"Therefore, manim has removed the {removed} oldest file(s)."
+            )
+        if self.cache_budget is not None:
+            files, freed = active_index().prune(max_bytes=self.cache_budget)
+            if files:
+                logger.info(f"Evicted {files} cached files ({format_size(freed)}) to stay within the cache budget")
+
+
+def index_svg(kind, svg_file):
+    index = active_index()
+    if not index.lookup(svg_file):
+        index.record(svg_file, kind)
+
+
+add_svg_hooks(after=index_svg)
+
+
+def cache_command(argv):
+    # render.py cache stats|prune
+    parser = argparse.ArgumentParser(prog='render.py cache', description='Inspect and prune the render cache.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    stats_parser = commands.add_parser('stats', help='Show what the cache holds per kind, scene and resolution')
+    stats_parser.add_argument('--rescan', action='store_true',
+                              help='Index cached files the index does not know yet and forget deleted ones')
+    prune_parser = commands.add_parser('prune', help='Evict cached files')
+    prune_parser.add_argument('--max-size', type=parse_size, default=None,
+                              help='Evict until the cache is at most this big (e.g. 2G, 500M)')
+    prune_parser.add_argument('--max-age', type=float, default=None,
+                              help='Evict files not used for this many days')
+    prune_parser.add_argument('--policy', choices=['lru', 'lfu'], default='lru',
+                              help='Evict least recently (lru) or least often (lfu) used files first')
+    prune_parser.add_argument('--dry-run', action='store_true', help='Only report what would be evicted')
+    args = parser.parse_args(argv)
+
+    index = active_index()
+    if args.command == 'stats':
+        if args.rescan:
+            stale, added = index.rescan()
+            print(f"Forgot {stale} deleted and indexed {added} new files")
+        rows = index.stats()
+        if not rows:
+            print(f"The cache index {index.path} is empty (run with --rescan to index existing files)")
+            return
+        print(f"{'kind':6} {'scene':28} {'resolution':14} {'files':>6} {'size':>11} {'hits':>6}  last used")
+        for kind, scene, resolution, files, size, first, last, hits in rows:
+            last_used = time.strftime('%Y-%m-%d %H:%M', time.localtime(last))
+            print(f"{kind:6} {scene:28} {resolution:14} {files:6d} {format_size(size):>11} {hits:6d}  {last_used}")
+        print(f"Total {format_size(index.total_size())} in {sum(row[3] for row in rows)} files")
+    else:
+        if args.max_size is None and args.max_age is None:
+            parser.error('prune needs --max-size and/or --max-age')
+        max_age = args.max_age * 86400 if args.max_age is not None else None
+        files, freed = index.prune(args.max_size, max_age, args.policy, dry_run=args.dry_run)
+        verb = 'Would evict' if args.dry_run else 'Evicted'
+        print(f"{verb} {files} files ({format_size(freed)}), {format_size(index.total_size() - (freed if args.dry_run else 0))} left")
@@ -1,33 +1,116 @@
 from manim import *
+from pathlib import Path
+import hashlib
+import json
 import os
+import shutil
 import subprocess
 import sys
 
-def check_latex_installation():
-    print("Checking LaTeX installation...")
+# Common installation locations, searched when the compiler is not in PATH
+LATEX_BIN_DIRS = [
+    "C:\\Program Files\\MiKTeX\\miktex\\bin\\x64",
+    "C:\\texlive\\2024\\bin\\win32",
+    os.path.expanduser("~\\AppData\\Local\\Programs\\MiKTeX\\miktex\\bin\\x64"),
+]
+
+# Results of probe_latex for this process, by compiler
+latex_probes = {}
+
+def find_latex(compiler="latex"):
+    # Path of the compiler binary, adding a known installation directory to
+    # PATH if that is where it lives. None if it cannot be found.
+    path = shutil.which(compiler)
+    if path is not None:
+        return path
+    for bin_dir in LATEX_BIN_DIRS:
+        path = shutil.which(compiler, path=bin_dir)
+        if path is not None:
+            os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+            print(f"Added {bin_dir} to PATH")
+            return path
+    return None
+
+def latex_probe_file():
+    # Not in tex_dir, whose non-SVG files are deleted after every compile
+    return Path(config.get_dir("media_dir")) / "latex_toolchain.json"
+
+def probe_latex(compiler="latex"):
+    """Locate the compiler and run ``<compiler> --version`` once.
+
+    Returns a dict with the binary's ``path`` (None if not found), whether it
+    ran (``ok``) and the first line of its output (``version``). The result is
+    kept for the process and on disk, keyed by PATH and the binary's mtime, so
+    the subprocess only runs again after PATH or the installation changes.
+    """
+    if compiler in latex_probes:
+        return latex_probes[compiler]
+
+    path = find_latex(compiler)
+    if path is None:
+        probe = {"path": None, "ok": False, "version": ""}
+        latex_probes[compiler] = probe
+        return probe
+
+    key = hashlib.sha256(
+        repr((compiler, os.environ["PATH"], path, os.path.getmtime(path))).encode()
+    ).hexdigest()
+    probe_file = latex_probe_file()
     try:
-        # Check if latex is available in PATH
-        result = subprocess.run(["latex", "--version"], 
-                                capture_output=True, 
-                                text=True)
-        if result.returncode == 0:
-            print("LaTeX is installed and accessible:")
-            print(result.stdout.split("\n")[0])
+        probes = json.loads(probe_file.read_text())
+    except (OSError, ValueError):
+        probes = {}
+    if key in probes:
+        latex_probes[compiler] = probes[key]
+        return probes[key]
+
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True)
+        ok = result.returncode == 0
+        output = result.stdout if ok else result.stderr
+    except OSError as error:
+        ok, output = False, str(error)
+    probe = {"path": path, "ok": ok, "version": output.strip().split("\n")[0]}
+
+    # Only the latest result per compiler is kept
+    probes = {k: v for k, v in probes.items() if v.get("compiler") != compiler}
+    probes[key] = dict(probe, compiler=compiler)
+    try:
+        probe_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = probe_file.with_name(f"{probe_file.stem}_{os.getpid()}.tmp")
+        temp_file.write_text(json.dumps(probes, indent=1))
+        os.replace(temp_file, probe_file)
+    except OSError:
+        pass
+    latex_probes[compiler] = probes[key]
+    return probes[key]
+
+def ensure_latex(compiler="latex"):
+    # Called right before a Tex compile: make sure the toolchain is in PATH
+    # and report once per process if it does not work
+    first_probe = compiler not in latex_probes
+    probe = probe_latex(compiler)
+    if first_probe and not probe["ok"]:
+        if probe["path"] is None:
+            logger.warning(f"{compiler} was not found in PATH or the usual installation directories")
         else:
-            print("LaTeX command failed with error:")
-            print(result.stderr)
-    except FileNotFoundError:
-        print("LaTeX not found in PATH")
-        
-        # Check common installation locations
-        possible_paths = [
-            "C:\\Program Files\\MiKTeX\\miktex\\bin\\x64\\latex.exe",
-            "C:\\texlive\\2024\\bin\\win32\\latex.exe",
-            os.path.expanduser("~\\AppData\\Local\\Programs\\MiKTeX\\miktex\\bin\\x64\\latex.exe")
-        ]
-        for path in possible_paths:
-            if os.path.exists(path):
-                print(f"Found LaTeX at: {path}")
+            logger.warning(f"{compiler} is in PATH but not working properly: {probe['version']}")
+    return probe
+
+def check_latex_installation():
+    print("Checking LaTeX installation...")
+    probe = probe_latex("latex")
+    if probe["ok"]:
+        print("LaTeX is installed and accessible:")
+        print(probe["path"])
+        print(probe["version"])
+    elif probe["path"] is not None:
+        print("LaTeX command failed with error:")
+        print(probe["version"])
+    else:
+        print("LaTeX not found in PATH or in:")
+        for bin_dir in LATEX_BIN_DIRS:
+            print(f"- {bin_dir}")
                 
 def check_available_tex_templates():
     print("\nAvailable TeX templates in Manim:")
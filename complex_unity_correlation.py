@@ -1,35 +1,29 @@
 from manim import *
 import numpy as np
-from scipy import stats
-import os
-import sys
+from polygon_stats import regular_polygon_stats
+from scene_snapshot import SnapshotScene
+from numeric_label import NumericLabel
+from coordinates import coords_to_points
+from dot_cloud import DotCloud
 
-# Add MiKTeX to the system PATH
-miktex_path = "C:\\Program Files\\MiKTeX\\miktex\\bin\\x64"
-if os.path.exists(miktex_path) and miktex_path not in os.environ["PATH"]:
-    os.environ["PATH"] = miktex_path + os.pathsep + os.environ["PATH"]
-    print(f"Added {miktex_path} to PATH")
+class ComplexUnityCorrelation(SnapshotScene):
+    # Each segment starts with self.clear(), so they can be rendered on their own
+    segments = [
+        "introduction",
+        "explain_complex_roots",
+        "correlation_and_regression",
+        "mathematical_explanation",
+        "conclusion",
+    ]
 
-# Check if LaTeX is accessible
-try:
-    import subprocess
-    result = subprocess.run(["latex", "--version"], 
-                            capture_output=True, 
-                            text=True)
-    if result.returncode == 0:
-        print("LaTeX is accessible for rendering")
-    else:
-        print("LaTeX is in PATH but not working properly")
-except Exception as e:
-    print(f"Error checking LaTeX: {e}")
-
-class ComplexUnityCorrelation(Scene):
-    def __init__(self, **kwargs):
+    def __init__(self, segments=None, **kwargs):
+        # Only render the given segments (used by the parallel renderer)
+        if segments is not None:
+            self.segments = list(segments)
         # Just use the default template, we've fixed the PATH
         super().__init__(**kwargs)
         
     def setup(self):
-        super().setup()
         # Add a black border around the frame
         # 2mm converted to Manim units (based on 8 height units)
         border_width = 0.075  # 2mm in Manim units
@@ -49,22 +43,15 @@ class ComplexUnityCorrelation(Scene):
         
         # Add the border to the scene
         self.add(self.border)
+        # Last, so a restored snapshot replaces the fresh border
+        super().setup()
         
     def construct(self):
-        # Introduction
-        self.introduction()
-        
-        # Define and show complex roots of unity
-        self.explain_complex_roots()
-        
-        # Show correlation and regression for different polygons
-        self.correlation_and_regression()
-        
-        # Mathematical explanation with LaTeX
-        self.mathematical_explanation()
-        
-        # Conclusion
-        self.conclusion()
+        # Introduction, complex roots of unity, correlation and regression for
+        # different polygons, mathematical explanation and conclusion
+        for segment in self.segments:
+            self.next_section(segment)
+            getattr(self, segment)()
         
         # Make sure the border is on top at the end
         self.bring_to_front(self.border)
@@ -120,11 +107,13 @@ class ComplexUnityCorrelation(Scene):
         self.wait(0.5)
 
         # Animate n-th roots of unity for n=3 to n=8
-        for n in range(3, 9):
-            points = [np.array([np.cos(2 * np.pi * k / n), np.sin(2 * np.pi * k / n), 0]) for k in range(n)]
-            dots = VGroup(*[Dot(plane.c2p(*p[:2]), color=BLUE, radius=0.08) for p in points])
-            lines = VGroup(*[Line(plane.c2p(0, 0), plane.c2p(*p[:2]), color=RED) for p in points])
-            polygon = Polygon(*[plane.c2p(*p[:2]) for p in points], color=GREEN)
+        roots = regular_polygon_stats(range(3, 9))
+        for i, n in enumerate(roots.sides):
+            vertices = coords_to_points(plane, roots.polygon_vertices(i))
+            center = plane.c2p(0, 0)
+            dots = DotCloud(vertices, color=BLUE, radius=0.08)
+            lines = VGroup(*[Line(center, vertex, color=RED) for vertex in vertices])
+            polygon = Polygon(*vertices, color=GREEN)
 
             formula = MathTex(
                 r"z_k = e^{i\frac{2\pi k}{" + str(n) + r"}}, \; k = 0,1,\ldots," + str(n-1),
@@ -214,12 +203,12 @@ class ComplexUnityCorrelation(Scene):
         
         # Create correlation text with LaTeX
         corr_text = MathTex(r"\text{Correlation: }", font_size=36)
-        corr_value = MathTex(r"0.0000", font_size=36)
+        corr_value = NumericLabel("0.0000", font_size=36)
         corr_group = VGroup(corr_text, corr_value).arrange(RIGHT)
         
         # Create regression equation text with LaTeX
         reg_eq_text = MathTex(r"\text{Regression: }", font_size=36)
-        reg_eq_value = MathTex(r"y = 0.0000x + 0.0000", font_size=36)
+        reg_eq_value = NumericLabel("y = 0.0000x + 0.0000", font_size=36)
         reg_eq_group = VGroup(reg_eq_text, reg_eq_value).arrange(RIGHT)
         
         # Create additional info text
@@ -249,51 +238,44 @@ class ComplexUnityCorrelation(Scene):
         polygon_sides = [3, 4, 5, 6, 8]
         polygon_colors = [RED, GREEN, BLUE, YELLOW, PURPLE]
         
+        # Vertices, correlation and regression of every polygon in one pass
+        polygon_stats = regular_polygon_stats(polygon_sides, radii=2)
+        
         # Function to get regression line
-        def get_regression_line(points, axes):
-            x_coords = [p[0] for p in points]
-            y_coords = [p[1] for p in points]
-            
-            slope, intercept, r_value, p_value, std_err = stats.linregress(x_coords, y_coords)
+        def get_regression_line(i, axes):
+            slope, intercept = polygon_stats.slope[i], polygon_stats.intercept[i]
             
-            x_min, x_max = min(x_coords), max(x_coords)
+            x_min, x_max = polygon_stats.x_min[i], polygon_stats.x_max[i]
             extension = (x_max - x_min) * 0.5
             x_line = np.array([x_min - extension, x_max + extension])
             y_line = slope * x_line + intercept
             
-            line_start = axes.c2p(x_line[0], y_line[0])
-            line_end = axes.c2p(x_line[1], y_line[1])
+            line_start, line_end = coords_to_points(axes, np.column_stack([x_line, y_line]))
             
             return Line(line_start, line_end, color=GREEN, stroke_width=3), slope, intercept  # Thicker line
         
         for i, n_sides in enumerate(polygon_sides):
-            # Generate points for the regular polygon
-            points = []
-            for j in range(n_sides):
-                angle = 2 * np.pi * j / n_sides
-                point = 2 * np.array([np.cos(angle), np.sin(angle), 0])
-                points.append(point)
+            # Vertices of the regular polygon
+            points = polygon_stats.polygon_vertices(i)
             
             # Create the polygon and dots with improved visibility
-            polygon_vertices = [axes.c2p(*p[:2]) for p in points]
+            polygon_vertices = coords_to_points(axes, points)
             polygon = Polygon(*polygon_vertices, color=polygon_colors[i], stroke_width=3)  # Thicker lines
-            dots = VGroup(*[Dot(vertex, color=WHITE, radius=0.08) for vertex in polygon_vertices])  # Larger dots
+            dots = DotCloud(polygon_vertices, color=WHITE, radius=0.08)  # Larger dots
             
             # Calculate and display correlation
-            x_coords = [p[0] for p in points]
-            y_coords = [p[1] for p in points]
-            correlation = np.corrcoef(x_coords, y_coords)[0, 1]
+            correlation = polygon_stats.correlation[i]
             
-            # Update correlation display with LaTeX - larger font
-            new_corr_value = MathTex(f"{correlation:.4f}", font_size=36)
+            # Update correlation display from precompiled glyphs - larger font
+            new_corr_value = NumericLabel(f"{correlation:.4f}", font_size=36)
             new_corr_value.move_to(corr_value)
             
             # Calculate and display regression line
-            reg_line, slope, intercept = get_regression_line(points, axes)
+            reg_line, slope, intercept = get_regression_line(i, axes)
             
             # Update regression equation - larger font
             sign = "+" if intercept >= 0 else ""
-            new_reg_eq_value = MathTex(f"y = {slope:.4f}x {sign} {intercept:.4f}", font_size=36)
+            new_reg_eq_value = NumericLabel(f"y = {slope:.4f}x {sign} {intercept:.4f}", font_size=36)
             new_reg_eq_value.move_to(reg_eq_value)
             
             # Show polygon with sides count - larger font
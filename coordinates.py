@@ -0,0 +1,34 @@
+from manim import *
+import numpy as np
+
+
+def coords_to_points(axes, coords):
+    """Scene points of many coordinates at once.
+
+    ``coords`` is an (N, 2) or (N, 3) array (or list of rows) of coordinates
+    on ``axes`` (Axes, NumberPlane, ComplexPlane, ThreeDAxes); columns beyond
+    the number of axes are ignored. Returns an (N, 3) array, also for N = 1.
+    Same result as ``axes.c2p(*row)`` for every row, including log-scaled
+    axes, but each axis converts its whole column in one NumberLine call
+    instead of one Python call per point.
+    """
+    coords = np.asarray(coords, dtype=float)
+    if coords.ndim != 2:
+        raise ValueError(f"Expected an (N, 2) or (N, 3) array of coordinates, got shape {coords.shape}")
+    if len(coords) == 0:
+        return np.zeros((0, 3))
+    # The same origin Axes.coords_to_point subtracts for every axis but x
+    origin = axes.x_axis.number_to_point(axes._origin_shift([axes.x_axis.x_min, axes.x_axis.x_max]))
+    points = np.zeros((len(coords), 3))
+    for index, axis in enumerate(axes.get_axes()[: coords.shape[1]]):
+        points += axis.number_to_point(coords[:, index]).reshape(-1, 3)
+        if index > 0:
+            points -= origin
+    return points
+
+
+def points_to_coords(axes, points):
+    """Coordinates on ``axes`` of an (N, 3) array of scene points, as an
+    (N, number of axes) array; the inverse of :func:`coords_to_points`."""
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    return np.column_stack([np.atleast_1d(axis.point_to_number(points)) for axis in axes.get_axes()])
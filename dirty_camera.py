@@ -0,0 +1,115 @@
+from manim import *
+import numpy as np
+
+
+class DirtyRectCamera(Camera):
+    """Camera that only clears and redraws the part of the frame that changes.
+
+    While a play is rendered, CairoRenderer resets the whole canvas to the
+    static image and rasterizes the moving mobjects over the full frame for
+    every frame. This camera keeps the previous frame instead, restores the
+    static image only inside the union of the previous and current bounding
+    boxes of the moving mobjects, and clips drawing to that rectangle.
+    Everything outside it is already the static image. It falls back to the
+    full-frame path on the first frame of a play, when the dirty area covers
+    more than ``max_dirty_fraction`` of the frame, or when something other
+    than plain VMobjects is moving.
+    """
+
+    max_dirty_fraction = 0.5
+    # Pixels added around each box for antialiasing
+    dirty_padding = 2
+
+    def reset(self):
+        self.invalidate_dirty_rect()
+        return super().reset()
+
+    def invalidate_dirty_rect(self):
+        self.dirty_background = None
+        self.pending_background = None
+        self.previous_rect = None
+
+    def set_frame_to_background(self, background):
+        # Restored lazily in capture_mobjects, once the dirty area is known
+        self.pending_background = background
+
+    def capture_mobjects(self, mobjects, **kwargs):
+        background, self.pending_background = self.pending_background, None
+        if background is None:
+            self.invalidate_dirty_rect()
+            return super().capture_mobjects(mobjects, **kwargs)
+
+        mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        rect = self.get_pixel_rect(mobjects)
+        dirty = None
+        if background is self.dirty_background and rect is not None and self.previous_rect is not None:
+            dirty = self.union_rect(self.previous_rect, rect)
+            x0, y0, x1, y1 = dirty
+            if (x1 - x0) * (y1 - y0) > self.max_dirty_fraction * self.pixel_width * self.pixel_height:
+                dirty = None
+
+        # Holding a reference keeps the identity check above safe
+        self.dirty_background = background
+        self.previous_rect = rect
+        if dirty is None:
+            self.set_pixel_array(background)
+            super().capture_mobjects(mobjects, include_submobjects=False)
+            return
+
+        x0, y0, x1, y1 = dirty
+        if x1 <= x0 or y1 <= y0:
+            return
+        self.pixel_array[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+        ctx = self.get_cairo_context(self.pixel_array)
+        # Build the clip path in pixels; the path survives restoring the
+        # frame-to-pixel matrix, the clip is dropped by the final restore
+        ctx.save()
+        ctx.identity_matrix()
+        ctx.rectangle(x0, y0, x1 - x0, y1 - y0)
+        ctx.restore()
+        ctx.save()
+        ctx.clip()
+        try:
+            super().capture_mobjects(mobjects, include_submobjects=False)
+        finally:
+            ctx.restore()
+
+    def get_pixel_rect(self, mobjects):
+        # Bounding box (x0, y0, x1, y1) in pixels of everything that will be
+        # drawn, or None if it cannot be bounded cheaply
+        points = []
+        padding = 0.0
+        for mobject in mobjects:
+            if not isinstance(mobject, VMobject) or mobject.get_background_image():
+                return None
+            if len(mobject.points) == 0:
+                continue
+            points.append(mobject.points)
+            # Miter joins reach up to 5 line widths beyond the path
+            width = max(mobject.get_stroke_width(), mobject.get_stroke_width(background=True))
+            padding = max(padding, 5 * width * self.cairo_line_width_multiple)
+        if not points:
+            return (0, 0, 0, 0)
+        points = np.vstack(points)
+        mins = points[:, :2].min(axis=0) - padding
+        maxs = points[:, :2].max(axis=0) + padding
+
+        x_scale = self.pixel_width / self.frame_width
+        y_scale = self.pixel_height / self.frame_height
+        x0 = (mins[0] - self.frame_center[0]) * x_scale + self.pixel_width / 2
+        x1 = (maxs[0] - self.frame_center[0]) * x_scale + self.pixel_width / 2
+        y0 = self.pixel_height / 2 - (maxs[1] - self.frame_center[1]) * y_scale
+        y1 = self.pixel_height / 2 - (mins[1] - self.frame_center[1]) * y_scale
+        return (
+            int(max(0, np.floor(x0) - self.dirty_padding)),
+            int(max(0, np.floor(y0) - self.dirty_padding)),
+            int(min(self.pixel_width, np.ceil(x1) + self.dirty_padding)),
+            int(min(self.pixel_height, np.ceil(y1) + self.dirty_padding)),
+        )
+
+    def union_rect(self, a, b):
+        if a[2] <= a[0] or a[3] <= a[1]:
+            return b
+        if b[2] <= b[0] or b[3] <= b[1]:
+            return a
+        return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
@@ -0,0 +1,100 @@
+from manim import *
+import numpy as np
+
+
+def unit_circle_template(n_arcs=4):
+    # Cubic bezier control points (anchor, handle, handle, anchor) of a unit
+    # circle made of ``n_arcs`` arcs, as an (n_arcs * 4, 3) array
+    angles = np.linspace(0, TAU, n_arcs + 1)
+    start, end = angles[:-1], angles[1:]
+    handle = 4 / 3 * np.tan((end - start) / 4)
+    start_points = np.column_stack([np.cos(start), np.sin(start), np.zeros(n_arcs)])
+    end_points = np.column_stack([np.cos(end), np.sin(end), np.zeros(n_arcs)])
+    start_tangents = np.column_stack([-np.sin(start), np.cos(start), np.zeros(n_arcs)])
+    end_tangents = np.column_stack([-np.sin(end), np.cos(end), np.zeros(n_arcs)])
+    curves = np.stack(
+        [
+            start_points,
+            start_points + handle[:, None] * start_tangents,
+            end_points - handle[:, None] * end_tangents,
+            end_points,
+        ],
+        axis=1,
+    )
+    return curves.reshape(-1, 3)
+
+
+class DotCloud(VMobject):
+    """Many equal dots as a single VMobject.
+
+    A ``VGroup(*[Dot(p) for p in points])`` is one Circle per point, each with
+    its own style arrays and its own fill call in every frame. Here the
+    ``N`` centers are offset copies of one unit-circle template (four cubic
+    arcs) stored as the subpaths of one point array, so the camera fills all
+    dots in one pass and hashing, copying and moving the cloud are array
+    operations. Create and FadeIn work as for any VMobject; a Transform
+    between two clouds of different sizes splits dots of the smaller one
+    instead of collapsing the extra dots into a single point.
+    """
+
+    def __init__(
+        self,
+        points,
+        radius=DEFAULT_DOT_RADIUS,
+        color=WHITE,
+        fill_opacity=1.0,
+        stroke_width=0,
+        n_arcs=4,
+        **kwargs,
+    ):
+        self.radius = radius
+        self.template = unit_circle_template(n_arcs)
+        self.initial_centers = np.asarray(points, dtype=float).reshape(-1, 3)
+        super().__init__(color=color, fill_opacity=fill_opacity, stroke_width=stroke_width, **kwargs)
+
+    def generate_points(self):
+        self.set_centers(self.initial_centers)
+
+    @property
+    def n_dots(self):
+        return len(self.points) // len(self.template)
+
+    def get_centers(self):
+        # Each dot's template is symmetric about its center
+        return self.points.reshape(self.n_dots, len(self.template), 3).mean(axis=1)
+
+    def get_radius(self):
+        # Read off the first dot, so it follows scale() and set_width() on
+        # the cloud
+        if self.n_dots == 0:
+            return self.radius
+        dot = self.points[: len(self.template)]
+        return np.linalg.norm(dot[0] - dot.mean(axis=0))
+
+    def set_centers(self, centers):
+        centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        self.radius = self.get_radius()
+        self.points = (centers[:, None, :] + self.radius * self.template[None, :, :]).reshape(-1, 3)
+        return self
+
+    def resize_dots(self, n_dots):
+        # Repeat dots (each one as evenly as possible) until there are n_dots
+        if n_dots == self.n_dots or self.n_dots == 0:
+            return self
+        dots = self.points.reshape(self.n_dots, len(self.template), 3)
+        indices = np.arange(n_dots) * self.n_dots // n_dots
+        self.points = dots[indices].reshape(-1, 3)
+        return self
+
+    def align_points(self, vmobject):
+        if (
+            not isinstance(vmobject, DotCloud)
+            or len(vmobject.template) != len(self.template)
+            or not (self.n_dots and vmobject.n_dots)
+        ):
+            return super().align_points(vmobject)
+        self.align_rgbas(vmobject)
+        n_dots = max(self.n_dots, vmobject.n_dots)
+        self.resize_dots(n_dots)
+        vmobject.resize_dots(n_dots)
+        return self
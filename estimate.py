@@ -0,0 +1,194 @@
+from manim import *
+from manim.renderer import cairo_renderer
+from manim.mobject.text import tex_mobject
+from manim.utils.exceptions import EndSceneEarlyException
+from tex_batch import record_tex_requests
+import numpy as np
+import os
+import subprocess
+import tempfile
+import time
+
+# (pixel_width, pixel_height, frame_rate) of render.py's --quality presets
+QUALITIES = {
+    "low": (854, 480, 15),
+    "medium": (1280, 720, 30),
+    "high": (1920, 1080, 60),
+}
+
+
+def frame_count(duration, frame_rate, frozen):
+    # Frames manim writes for one play: a static wait is int(duration / dt)
+    # frames, an animation one frame per step of np.arange(0, run_time, dt)
+    if frozen:
+        return int(duration * frame_rate)
+    return len(np.arange(0, duration, 1 / frame_rate))
+
+
+class EstimateRenderer(CairoRenderer):
+    """CairoRenderer that runs construct without rasterizing or encoding.
+
+    Every play is hashed and looked up in the partial movie cache exactly as
+    in a real render, then skipped. Its duration, whether it is a static
+    wait and whether it is cached are kept in ``play_records``. Every
+    ``sample_every``-th play the full frame is rasterized once at each
+    quality, which gives the per-frame rasterization cost of this scene on
+    this machine.
+    """
+
+    sample_every = 10
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        self.play_records = []
+        self.hash_time = 0.0
+        self.raster_samples = {quality: [] for quality in QUALITIES}
+        self.sample_frames = {}
+
+    def play(self, scene, *args, **kwargs):
+        self.skip_animations = True
+        scene.compile_animation_data(*args, **kwargs)
+
+        cached = False
+        if not config["disable_caching"]:
+            start = time.perf_counter()
+            hash_current_animation = cairo_renderer.get_hash_from_play_call(
+                scene,
+                self.camera,
+                scene.animations,
+                scene.mobjects,
+            )
+            cached = self.file_writer.is_already_cached(hash_current_animation)
+            self.hash_time += time.perf_counter() - start
+        frozen = scene.is_current_animation_frozen_frame()
+        self.play_records.append((scene.duration, frozen, cached))
+
+        if self.num_plays % self.sample_every == 0:
+            self.sample_raster_cost(scene)
+
+        self.time += scene.duration
+        scene.begin_animations()
+        if not frozen:
+            scene.play_internal(skip_rendering=True)
+        self.num_plays += 1
+
+    def sample_raster_cost(self, scene):
+        for quality, (width, height, frame_rate) in QUALITIES.items():
+            camera = type(self.camera)(pixel_width=width, pixel_height=height, frame_rate=frame_rate)
+            start = time.perf_counter()
+            camera.capture_mobjects(scene.mobjects)
+            self.raster_samples[quality].append(time.perf_counter() - start)
+            self.sample_frames[quality] = camera.pixel_array
+
+    def scene_finished(self, scene):
+        # Nothing was written, so there is no movie to combine
+        pass
+
+
+def measure_encode_cost(frame, frame_rate):
+    # Seconds per frame for the ffmpeg pipe manim uses, encoding one second
+    # of the given frame with libx264 into a throwaway file
+    height, width = frame.shape[:2]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        command = [
+            config.ffmpeg_executable,
+            "-y",
+            "-f", "rawvideo",
+            "-s", f"{width}x{height}",
+            "-pix_fmt", "rgba",
+            "-r", str(frame_rate),
+            "-i", "-",
+            "-an",
+            "-loglevel", "error",
+            "-vcodec", "libx264",
+            "-pix_fmt", "yuv420p",
+            os.path.join(temp_dir, "estimate.mp4"),
+        ]
+        start = time.perf_counter()
+        process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        # Vary the pixels a little so x264 does real work on every frame
+        for index in range(frame_rate):
+            shifted = np.roll(frame, index, axis=1)
+            process.stdin.write(shifted.tobytes())
+        process.stdin.close()
+        process.wait()
+        return (time.perf_counter() - start) / frame_rate
+
+
+def estimate_render(scene_class, renderer):
+    """Dry-run ``scene_class`` and print its play/frame counts and cache
+    misses, plus the predicted wall time of rendering it at each quality.
+
+    ``renderer`` should be built with EstimateRenderer first in its bases, so
+    the camera, file writer and hashing match the render being estimated.
+    Only the partial movies of the current config's quality can be looked
+    up; the other qualities are estimated as if nothing were cached.
+    """
+    text_dir = config.get_dir("text_dir")
+    text_dir.mkdir(parents=True, exist_ok=True)
+    text_before = set(text_dir.glob("*.svg"))
+
+    construct_start = time.perf_counter()
+    # Uncached Tex gets a placeholder, so a play containing one is reported
+    # as uncached, which it is (its SVG never existed)
+    with tempconfig({"preview": False}), record_tex_requests() as tex_requests:
+        scene = scene_class(renderer=renderer)
+        scene.setup()
+        try:
+            scene.construct()
+        except EndSceneEarlyException:
+            pass
+        scene.tear_down()
+    construct_time = time.perf_counter() - construct_start
+
+    # Text is rendered by Pango during the dry run, so the real render finds
+    # these already cached
+    text_misses = len(set(text_dir.glob("*.svg")) - text_before)
+    tex_misses = list(
+        {(expression, environment): (expression, environment, template) for expression, environment, template in tex_requests}.values()
+    )
+    tex_cost = 0.0
+    if tex_misses:
+        # Compile one missing expression for real to time it; it stays cached
+        start = time.perf_counter()
+        tex_mobject.tex_to_svg_file(*tex_misses[0])
+        tex_cost = time.perf_counter() - start
+
+    records = renderer.play_records
+    cached_plays = sum(cached for _, _, cached in records)
+    current_quality = next(
+        (
+            quality
+            for quality, (width, height, frame_rate) in QUALITIES.items()
+            if (width, height, frame_rate) == (config.pixel_width, config.pixel_height, config.frame_rate)
+        ),
+        None,
+    )
+
+    print(f"Plays: {len(records)} ({cached_plays} partial movies already cached at "
+          f"{config.pixel_height}p{config.frame_rate})")
+    print(f"Tex/MathTex cache misses: {len(tex_misses)} (one compiled to time it: {tex_cost:.2f}s)")
+    print(f"Text cache misses: {text_misses} (rendered during the estimate)")
+    print(f"Construct and hashing without rendering: {construct_time:.1f}s "
+          f"(hashing {renderer.hash_time:.1f}s)")
+
+    for quality, (width, height, frame_rate) in QUALITIES.items():
+        samples = renderer.raster_samples[quality]
+        if not samples:
+            continue
+        raster_cost = sum(samples) / len(samples)
+        encode_cost = measure_encode_cost(renderer.sample_frames[quality], frame_rate)
+
+        frames = 0
+        render_time = 0.0
+        for duration, frozen, cached in records:
+            count = frame_count(duration, frame_rate, frozen)
+            frames += count
+            if cached and quality == current_quality:
+                continue
+            # A static wait is rasterized once; every frame is still encoded
+            render_time += (1 if frozen else count) * raster_cost + count * encode_cost
+        total = construct_time + max(len(tex_misses) - 1, 0) * tex_cost + render_time
+        print(f"{quality:>6} {height}p{frame_rate}: {frames} frames, "
+              f"{raster_cost * 1000:.1f} ms/frame rasterizing, {encode_cost * 1000:.1f} ms/frame encoding, "
+              f"predicted {total / 60:.1f} min")
@@ -0,0 +1,36 @@
+from manim import *
+
+
+class FastForwardRenderer(CairoRenderer):
+    """CairoRenderer that jumps over the plays before ``config.from_animation_number``.
+
+    CairoRenderer skips those plays too, but still compiles each one fully,
+    rasterizes its static frame and steps it through ``play_internal``. Here
+    a skipped play only builds its animations, puts each at its end state
+    (``Animation.finish``, i.e. ``interpolate(1)``) and runs the scene's
+    updaters once over the play's duration, which leaves the scene as a
+    skipped play would. Nothing is hashed, drawn or written, so a shard
+    starting at play 40 reaches it in a fraction of the time.
+    """
+
+    def play(self, scene, *args, **kwargs):
+        if self.num_plays >= config["from_animation_number"]:
+            return super().play(scene, *args, **kwargs)
+
+        animations = scene.compile_animations(*args, **kwargs)
+        scene.add_mobjects_from_animations(animations)
+        scene.animations = animations
+        duration = scene.get_run_time(animations)
+        for animation in animations:
+            animation._setup_scene(scene)
+            animation.begin()
+            animation.finish()
+            animation.clean_up_from_scene(scene)
+        if scene.should_update_mobjects():
+            scene.update_mobjects(duration)
+
+        # Keep partial movie indices in step with num_plays, as for any skip
+        self.file_writer.add_partial_movie_file(None)
+        self.animations_hashes.append(None)
+        self.time += duration
+        self.num_plays += 1
@@ -0,0 +1,107 @@
+from manim import *
+from manim import __version__
+from manim.utils.file_ops import is_webm_format, write_to_movie
+import subprocess
+
+
+class FrameHoldWriter:
+    """File writer mixin that encodes a frozen frame from a single input frame.
+
+    Opening a partial movie is deferred until the first frame arrives. If
+    that is a static hold (``write_static_frame``), ffmpeg receives the frame
+    once and repeats it with the ``tpad`` filter, or PyAV converts it once and
+    re-encodes the converted frame, so the movie keeps its constant frame rate
+    and frame count without piping the same pixels ``num_frames`` times.
+    """
+
+    def open_movie_pipe(self, file_path=None):
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.pending_movie_file = file_path
+
+    def open_pending_movie(self):
+        if getattr(self, "pending_movie_file", None) is not None:
+            file_path, self.pending_movie_file = self.pending_movie_file, None
+            super().open_movie_pipe(file_path=file_path)
+
+    def write_frame(self, frame_or_renderer):
+        self.open_pending_movie()
+        super().write_frame(frame_or_renderer)
+
+    def write_static_frame(self, frame, num_frames):
+        file_path = getattr(self, "pending_movie_file", None)
+        if (
+            num_frames <= 1
+            or file_path is None
+            or config.renderer != RendererType.CAIRO
+            or not write_to_movie()
+        ):
+            for _ in range(num_frames):
+                self.write_frame(frame)
+            return
+
+        self.pending_movie_file = None
+        if getattr(self, "uses_av", lambda: False)():
+            super().open_movie_pipe(file_path=file_path)
+            self.write_repeated_frame(frame, num_frames)
+        else:
+            self.open_hold_pipe(file_path, num_frames)
+            super().write_frame(frame)
+
+    def open_hold_pipe(self, file_path, num_frames):
+        # The same command as SceneFileWriter.open_movie_pipe, with the single
+        # input frame cloned up to num_frames by the encoder
+        self.partial_movie_file_path = file_path
+        fps = config["frame_rate"]
+        if fps == int(fps):  # fps is integer
+            fps = int(fps)
+        command = [
+            config.ffmpeg_executable,
+            "-y",  # overwrite output file if it exists
+            "-f",
+            "rawvideo",
+            "-s",
+            "%dx%d" % (config["pixel_width"], config["pixel_height"]),  # size of one frame
+            "-pix_fmt",
+            "rgba",
+            "-r",
+            str(fps),  # frames per second
+            "-i",
+            "-",  # The input comes from a pipe
+            "-an",  # Tells FFMPEG not to expect any audio
+            "-loglevel",
+            config["ffmpeg_loglevel"].lower(),
+            "-metadata",
+            f"comment=Rendered with Manim Community v{__version__}",
+            "-vf",
+            f"tpad=stop_mode=clone:stop={num_frames - 1}",
+        ]
+        if is_webm_format():
+            command += ["-vcodec", "libvpx-vp9", "-auto-alt-ref", "0"]
+        # .mov format
+        elif config["transparent"]:
+            command += ["-vcodec", "qtrle"]
+        else:
+            command += ["-vcodec", "libx264", "-pix_fmt", "yuv420p"]
+        command += [file_path]
+        self.writing_process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def close_movie_pipe(self):
+        # A play that wrote no frames still gets its (empty) movie, as before
+        self.open_pending_movie()
+        super().close_movie_pipe()
+
+
+class FrameHoldRenderer(CairoRenderer):
+    """CairoRenderer that hands frozen frames to the file writer as one hold."""
+
+    def freeze_current_frame(self, duration: float):
+        write_static_frame = getattr(self.file_writer, "write_static_frame", None)
+        if write_static_frame is None:
+            return super().freeze_current_frame(duration)
+        dt = 1 / self.camera.frame_rate
+        num_frames = int(duration / dt)
+        if self.skip_animations:
+            return
+        self.time += num_frames * dt
+        write_static_frame(self.get_frame(), num_frames)
@@ -0,0 +1,179 @@
+from manim import *
+from manim import __version__
+from manim.utils.file_ops import is_mp4_format, write_to_movie
+from pathlib import Path
+import subprocess
+
+# (pixel_width, pixel_height, frame_rate) of the renditions derived from a
+# 1920x1080@60 render: render.py's medium and low qualities
+LADDER_RUNGS = [
+    (1280, 720, 30),
+    (854, 480, 15),
+]
+
+
+def rung_name(rung):
+    width, height, frame_rate = rung
+    return f"{height}p{frame_rate}"
+
+
+def rung_movie_file(movie_file, rung):
+    # <name>_720p30.mp4 next to <name>.mp4
+    movie_file = Path(movie_file)
+    return movie_file.with_name(f"{movie_file.stem}_{rung_name(rung)}{movie_file.suffix}")
+
+
+class LadderWriter:
+    """File writer mixin that encodes lower renditions in the same pass.
+
+    Every partial movie also gets one ffmpeg process per rung of ``rungs``.
+    Each rung receives only every ``frame_rate / rung_frame_rate``-th frame,
+    counted from the start of the scene so that plays whose length is not a
+    multiple of the step do not drift, and ffmpeg area-downsamples it to the
+    rung's resolution. Which frames of a play a rung gets depends on where
+    the play starts, so a rung's partial movie is named by the play hash and
+    that offset. The rung's partial movies sit in a sibling directory of
+    the partial movie directory. At the end they are combined
+    into ``<movie>_<height>p<fps>.mp4`` next to the full-resolution movie.
+    Rungs that are not below the rendered resolution, or whose frame rate
+    does not divide the rendered one, are left out.
+    """
+
+    rungs = LADDER_RUNGS
+
+    def __init__(self, *args, **kwargs):
+        # Scene frame each play starts at, by play index
+        self.ladder_start_frames = []
+        self.ladder_cached_start = None
+        super().__init__(*args, **kwargs)
+
+    def active_rungs(self):
+        if not is_mp4_format() or config["transparent"]:
+            return []
+        return [
+            rung
+            for rung in self.rungs
+            if rung[1] < config["pixel_height"] and config["frame_rate"] % rung[2] == 0
+        ]
+
+    def rung_step(self, rung):
+        return int(config["frame_rate"] // rung[2])
+
+    def rung_partial_file(self, file_path, rung, start_frame):
+        # <hash>_<offset>.mp4, the offset being the first frame of the play
+        # that the rung skips to
+        file_path = Path(file_path)
+        rung_dir = file_path.parent.with_name(f"{file_path.parent.name}_{rung_name(rung)}")
+        rung_dir.mkdir(parents=True, exist_ok=True)
+        offset = -start_frame % self.rung_step(rung)
+        return rung_dir / f"{file_path.stem}_{offset}{file_path.suffix}"
+
+    def current_frame(self):
+        return round(self.renderer.time * config["frame_rate"])
+
+    def is_already_cached(self, hash_invocation):
+        # A play is only cached if every rung has its partial movie as well.
+        # Called before a cached play advances the renderer's time, so this
+        # is where its start is known
+        self.ladder_cached_start = self.current_frame()
+        if not super().is_already_cached(hash_invocation):
+            return False
+        file_path = self.partial_movie_directory / f"{hash_invocation}{config['movie_file_extension']}"
+        return all(
+            self.rung_partial_file(file_path, rung, self.ladder_cached_start).exists()
+            for rung in self.active_rungs()
+        )
+
+    def add_partial_movie_file(self, hash_animation):
+        # Any other play with a movie is added before the renderer's time moves
+        start_frame = self.ladder_cached_start
+        if start_frame is None:
+            start_frame = self.current_frame()
+        self.ladder_cached_start = None
+        self.ladder_start_frames.append(start_frame)
+        super().add_partial_movie_file(hash_animation)
+
+    def open_rung_pipe(self, file_path, rung, start_frame):
+        width, height, frame_rate = rung
+        command = [
+            config.ffmpeg_executable,
+            "-y",  # overwrite output file if it exists
+            "-f",
+            "rawvideo",
+            "-s",
+            "%dx%d" % (config["pixel_width"], config["pixel_height"]),  # size of one input frame
+            "-pix_fmt",
+            "rgba",
+            "-r",
+            str(frame_rate),  # the decimated frames arrive at the rung's rate
+            "-i",
+            "-",  # The input comes from a pipe
+            "-an",  # Tells FFMPEG not to expect any audio
+            "-loglevel",
+            config["ffmpeg_loglevel"].lower(),
+            "-metadata",
+            f"comment=Rendered with Manim Community v{__version__}",
+            "-vf",
+            f"scale={width}:{height}:flags=area",
+            "-vcodec",
+            "libx264",
+            "-pix_fmt",
+            "yuv420p",
+            str(self.rung_partial_file(file_path, rung, start_frame)),
+        ]
+        return subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def open_movie_pipe(self, file_path=None):
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        super().open_movie_pipe(file_path=file_path)
+        start_frame = self.ladder_start_frames[self.renderer.num_plays]
+        self.ladder_pipes = [
+            (self.rung_step(rung), self.open_rung_pipe(file_path, rung, start_frame))
+            for rung in self.active_rungs()
+        ]
+        self.ladder_frame_index = start_frame
+
+    def write_frame(self, frame_or_renderer):
+        super().write_frame(frame_or_renderer)
+        ladder_pipes = getattr(self, "ladder_pipes", None)
+        if not ladder_pipes:
+            return
+        frame_bytes = None
+        for step, process in ladder_pipes:
+            if self.ladder_frame_index % step == 0:
+                if frame_bytes is None:
+                    frame_bytes = frame_or_renderer.tobytes()
+                process.stdin.write(frame_bytes)
+        self.ladder_frame_index += 1
+
+    def close_movie_pipe(self):
+        super().close_movie_pipe()
+        for _, process in getattr(self, "ladder_pipes", []):
+            process.stdin.close()
+            process.wait()
+        self.ladder_pipes = []
+
+    def finish(self):
+        super().finish()
+        rungs = self.active_rungs()
+        if not write_to_movie() or not rungs:
+            return
+        partial_movie_files = [
+            (file, start_frame)
+            for file, start_frame in zip(self.partial_movie_files, self.ladder_start_frames)
+            if file is not None
+        ]
+        if not partial_movie_files:
+            return
+        for rung in rungs:
+            rung_files = [self.rung_partial_file(file, rung, start_frame) for file, start_frame in partial_movie_files]
+            movie_file = rung_movie_file(self.movie_file_path, rung)
+            self.combine_files(rung_files, movie_file)
+            logger.info(f"{rung_name(rung)} rendition ready at {movie_file}")
+
+            # Follow the cache cleanup of the full-resolution partial movies
+            for file in rung_files[0].parent.iterdir():
+                stem = file.stem.rsplit("_", 1)[0]
+                if not (self.partial_movie_directory / f"{stem}{file.suffix}").exists():
+                    file.unlink()
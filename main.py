@@ -1,6 +1,10 @@
 from manim import *
 from complex_unity_correlation import ComplexUnityCorrelation
 
+# Compiles uncached Tex through check_tex_template.ensure_latex, which adds
+# MiKTeX to PATH when it is not there yet
+import svg_hooks  # noqa: F401
+
 if __name__ == "__main__":
     # Configuration settings with proper 16:9 aspect ratio and improved rendering
     config.media_dir = "./videos"
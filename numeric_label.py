@@ -0,0 +1,122 @@
+from manim import *
+
+# Characters a NumericLabel can show, compiled together in one MathTex
+NUMERIC_GLYPHS = "0123456789.-+=xy"
+
+# Glyph set between the NUMERIC_GLYPHS in the compiled line, so that each
+# glyph's advance width can be read off the ink of its neighbours
+MARKER_GLYPH = "|"
+
+# Height of a Computer Modern digit in em, to turn glyph sizes into TeX spacing
+DIGIT_HEIGHT_EM = 0.644
+
+# Space on both sides of a relation (\thickmuskip) and of a binary operator
+# (\medmuskip), in em
+RELATION_SPACE_EM = 5 / 18
+BINARY_SPACE_EM = 4 / 18
+
+# Glyph sets by TeX preamble: {char: (glyph, center height above the
+# baseline, left ink edge from the start of its box, advance width)}
+glyph_sets = {}
+
+
+def numeric_glyphs():
+    # Compile every glyph once, in one line, so their baselines line up.
+    # Braced, every glyph is an ordinary atom, so TeX puts no math spacing
+    # between them and each box starts where the previous one ends. The line
+    # reads |, |, 0, |, 1, |, ..., y, |: two markers give the marker's
+    # advance, and the markers around a glyph give the glyph's advance and
+    # where its ink starts in its box (up to the marker's left side bearing,
+    # which is the same for every glyph).
+    body = config["tex_template"].body
+    if body not in glyph_sets or config["dry_run"]:
+        parts = ["{%s}" % MARKER_GLYPH] * 2
+        for char in NUMERIC_GLYPHS:
+            parts += ["{%s}" % char, "{%s}" % MARKER_GLYPH]
+        # Each glyph is a single path, so one compile of the whole line
+        # splits into them; otherwise let MathTex split it per glyph
+        line = SingleStringMathTex("".join(parts), font_size=DEFAULT_FONT_SIZE)
+        # A dry run (the Tex prefetch) only needs the line recorded. Its
+        # placeholder never splits into glyphs, and recording the fallback
+        # too would batch-compile an expression the real run does not use
+        if config["dry_run"]:
+            return {char: (line.copy(), 0.0, 0.0, line.width) for char in NUMERIC_GLYPHS}
+        if len(line.submobjects) != len(parts):
+            line = MathTex(*parts, font_size=DEFAULT_FONT_SIZE)
+        markers, chars = line[1::2], line[2::2]
+        marker_advance = line[1].get_left()[0] - line[0].get_left()[0]
+        baseline = chars[0].get_bottom()[1]
+        glyphs = {}
+        for index, (char, glyph) in enumerate(zip(NUMERIC_GLYPHS, chars)):
+            box_start = markers[index].get_left()[0] + marker_advance
+            advance = markers[index + 1].get_left()[0] - box_start
+            glyphs[char] = (
+                glyph.copy(),
+                glyph.get_center()[1] - baseline,
+                glyph.get_left()[0] - box_start,
+                advance,
+            )
+        glyph_sets[body] = glyphs
+    return glyph_sets[body]
+
+
+class NumericLabel(VMobject):
+    """Number or short formula assembled from precompiled MathTex glyphs.
+
+    Like DecimalNumber it is built from one submobject per character, but the
+    glyphs (digits, ``.``, ``-``, ``+``, ``=``, ``x`` and ``y``) come from a
+    single MathTex compiled once per TeX template, keeping their baselines
+    and advance widths, and are spaced the way TeX's math mode would: thick
+    space around ``=``, medium space around a binary ``+``/``-`` and none
+    after a sign. A label with any value, e.g.
+    ``NumericLabel(f"y = {slope:.4f}x {sign} {intercept:.4f}")``, therefore
+    needs no LaTeX run. Spaces in ``text`` are ignored.
+    """
+
+    def __init__(self, text, font_size=DEFAULT_FONT_SIZE, color=WHITE, **kwargs):
+        super().__init__(**kwargs)
+        self.text = text
+        self._font_size = font_size
+        glyphs = numeric_glyphs()
+        unknown = set(text) - set(NUMERIC_GLYPHS) - {" "}
+        if unknown:
+            raise ValueError(f"NumericLabel cannot show {''.join(sorted(unknown))!r}, only {NUMERIC_GLYPHS!r}")
+
+        scale = font_size / DEFAULT_FONT_SIZE
+        em = glyphs["0"][0].height * scale / DIGIT_HEIGHT_EM
+        chars = text.replace(" ", "")
+        cursor = 0.0
+        for index, char in enumerate(chars):
+            glyph, center, left, advance = glyphs[char]
+            space = self.space_around(chars, index) * em
+            glyph = glyph.copy().scale(scale)
+            glyph.move_to([cursor + space + left * scale + glyph.width / 2, center * scale, 0])
+            self.add(glyph)
+            cursor += advance * scale + 2 * space
+
+        self.move_to(ORIGIN)
+        self.set_color(color)
+        # track the initial height to enable scaling via font_size
+        self.initial_height = self.height
+
+    @staticmethod
+    def space_around(chars, index):
+        char = chars[index]
+        if char == "=":
+            return RELATION_SPACE_EM
+        # A sign right after a number or variable is a binary operator,
+        # anywhere else it belongs to the number that follows
+        if char in "+-" and index > 0 and chars[index - 1] not in "+-=":
+            return BINARY_SPACE_EM
+        return 0.0
+
+    @property
+    def font_size(self):
+        """The font size of the label."""
+        return self.height / self.initial_height * self._font_size
+
+    @font_size.setter
+    def font_size(self, font_val):
+        if font_val <= 0:
+            raise ValueError("font_size must be greater than 0.")
+        self.scale(font_val / self.font_size)
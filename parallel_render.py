@@ -0,0 +1,115 @@
+from manim import *
+from manim import __version__
+from manim.utils.file_ops import open_file
+from manim.utils.tex_file_writing import delete_nonsvg_files
+from concurrent.futures import ProcessPoolExecutor
+from ladder_writer import rung_movie_file, rung_name
+from pathlib import Path
+import subprocess
+
+# Config options copied from the parent process into every worker, so each
+# segment is rendered with exactly the same settings as a sequential render
+WORKER_CONFIG_KEYS = [
+    "media_dir",
+    "background_color",
+    "pixel_height",
+    "pixel_width",
+    "frame_rate",
+    "frame_height",
+    "frame_width",
+    "disable_caching",
+    "max_files_cached",
+    "ffmpeg_loglevel",
+    "movie_file_extension",
+    "tex_template",
+]
+
+
+def render_segment(scene_class, index, segment, config_overrides, make_renderer=None):
+    # Runs in a worker process: render a single segment to its own movie
+    for key, value in config_overrides.items():
+        config[key] = value
+    config.preview = False
+    config.output_file = f"{scene_class.__name__}_{index:02d}_{segment}"
+
+    # Every segment gets its own partial movie directory, so workers never
+    # share the concat list file or evict each other's cached partial movies
+    config.partial_movie_dir = f"{{video_dir}}/partial_movie_files/{{scene_name}}/{segment}"
+
+    renderer = make_renderer() if make_renderer is not None else None
+    scene = scene_class(segments=[segment], renderer=renderer)
+    scene.render()
+    return str(scene.renderer.file_writer.movie_file_path)
+
+
+def concat_movies(movie_files, output_file):
+    # Stream-copy concat, the same way manim combines partial movie files
+    output_file = Path(output_file)
+    file_list = output_file.with_name(f"{output_file.stem}_segment_list.txt")
+    with file_list.open("w", encoding="utf-8") as fp:
+        fp.write("# This file is used internally by FFMPEG.\n")
+        for movie_file in movie_files:
+            fp.write(f"file 'file:{Path(movie_file).as_posix()}'\n")
+
+    command = [
+        config.ffmpeg_executable,
+        "-y",  # overwrite output file if it exists
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        str(file_list),
+        "-loglevel",
+        config.ffmpeg_loglevel.lower(),
+        "-metadata",
+        f"comment=Rendered with Manim Community v{__version__}",
+        "-nostdin",
+        "-c",
+        "copy",
+        "-an",
+        str(output_file),
+    ]
+    subprocess.run(command, check=True)
+    file_list.unlink()
+    return output_file
+
+
+def render_parallel(scene_class, jobs, make_renderer=None, rungs=()):
+    # Render every segment of the scene in its own worker process, then
+    # stitch the segment movies together in construct order, along with the
+    # lower renditions of an output ladder
+    config_overrides = {key: config[key] for key in WORKER_CONFIG_KEYS}
+    # Workers share tex_dir, so none of them may clear out the .aux/.dvi/.log
+    # files another one is still compiling with; the parent does it at the end
+    config_overrides["no_latex_cleanup"] = True
+    segments = list(scene_class.segments)
+
+    print(f"Rendering {len(segments)} segments of {scene_class.__name__} with {jobs} workers...")
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(render_segment, scene_class, index, segment, config_overrides, make_renderer)
+            for index, segment in enumerate(segments)
+        ]
+        movie_files = [future.result() for future in futures]
+    if not config.no_latex_cleanup:
+        delete_nonsvg_files()
+
+    output_file = Path(movie_files[0]).with_name(f"{scene_class.__name__}{config.movie_file_extension}")
+    concat_movies(movie_files, output_file)
+    for movie_file in movie_files:
+        Path(movie_file).unlink()
+    print(f"File ready at {output_file}")
+
+    for rung in rungs:
+        rung_files = [rung_movie_file(movie_file, rung) for movie_file in movie_files]
+        if not all(rung_file.exists() for rung_file in rung_files):
+            continue
+        rung_output_file = concat_movies(rung_files, rung_movie_file(output_file, rung))
+        for rung_file in rung_files:
+            rung_file.unlink()
+        print(f"{rung_name(rung)} rendition ready at {rung_output_file}")
+
+    if config.preview:
+        open_file(output_file)
+    return output_file
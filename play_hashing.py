@@ -0,0 +1,229 @@
+from manim import *
+from manim.renderer import cairo_renderer
+from enum import Enum
+from types import CodeType, FunctionType, MethodType
+import numpy as np
+import zlib
+
+# Attribute values that go into a mobject's state stamp as they are. Its own
+# hash is cached on it and recomputed only when the stamp changes: any of
+# these values, a checksum of any array attribute (manim mutates points in
+# place, e.g. ``points += shift``, so a dirty flag would miss changes), a
+# color, or the identity of its submobjects, updaters and mobject references.
+# Other attributes (lists, dicts, plain objects) and the closures of its
+# updaters can change without any of that changing, so they are hashed anew
+# on every play instead of being cached.
+SCALAR_TYPES = (type(None), bool, int, float, complex, str, bytes, Enum, np.generic)
+
+# Left out of a mobject's own hash: covered by the family hash, run-dependent,
+# or the cache itself
+SKIPPED_MOBJECT_KEYS = {"submobjects", "updaters", "point_hash", "_play_hash_cache"}
+
+CAMERA_KEYS = (
+    "pixel_height",
+    "pixel_width",
+    "frame_height",
+    "frame_width",
+    "frame_center",
+    "frame_rate",
+    "_background_color",
+    "_background_opacity",
+    "background_image",
+    "cairo_line_width_multiple",
+    "use_z_index",
+    "image_mode",
+    "n_channels",
+)
+
+# How deep plain objects inside animations are followed
+MAX_DEPTH = 4
+
+code_hashes = {}
+
+
+def crc(value, seed=0):
+    if isinstance(value, np.ndarray):
+        return zlib.crc32(np.ascontiguousarray(value).view(np.uint8).ravel(), zlib.crc32(str(value.shape).encode(), seed))
+    return zlib.crc32(repr(value).encode(), seed)
+
+
+def const_hash(const, seed):
+    if isinstance(const, CodeType):
+        return crc(code_hash(const), seed)
+    if isinstance(const, frozenset):
+        # The repr of a set follows PYTHONHASHSEED, so it differs between runs
+        return crc(sorted(repr(item) for item in const), seed)
+    if isinstance(const, tuple):
+        result = crc(len(const), seed)
+        for item in const:
+            result = const_hash(item, result)
+        return result
+    return crc(const, seed)
+
+
+def code_hash(code):
+    # Code objects are immutable, so their hash is computed once
+    if code not in code_hashes:
+        result = crc(code.co_code)
+        for const in code.co_consts:
+            result = const_hash(const, result)
+        code_hashes[code] = crc(code.co_names, crc(code.co_name, result))
+    return code_hashes[code]
+
+
+def function_hash(function, memo, depth):
+    if isinstance(function, MethodType):
+        return crc(function.__name__, value_hash(function.__self__, memo, depth + 1))
+    result = code_hash(function.__code__)
+    for cell in function.__closure__ or ():
+        try:
+            result = value_hash(cell.cell_contents, memo, depth + 1, result)
+        except ValueError:  # empty cell
+            pass
+    for default in function.__defaults__ or ():
+        result = value_hash(default, memo, depth + 1, result)
+    return result
+
+
+def value_hash(value, memo, depth=0, seed=0):
+    # Hash an arbitrary attribute value found in an animation or mobject
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes, Enum)):
+        return crc(value, seed)
+    if isinstance(value, np.ndarray):
+        return crc(value, seed)
+    if isinstance(value, np.generic):
+        return crc(value.item(), seed)
+    if isinstance(value, ManimColor):
+        return crc(value.to_hex(with_alpha=True), seed)
+    if isinstance(value, Mobject):
+        return crc(family_hash(value, memo), seed)
+    if isinstance(value, (FunctionType, MethodType)):
+        return crc(function_hash(value, memo, depth), seed)
+    if depth >= MAX_DEPTH or id(value) in memo:
+        return crc(type(value).__qualname__, seed)
+    memo[id(value)] = value
+    if isinstance(value, (list, tuple)):
+        result = crc(len(value), seed)
+        for item in value:
+            result = value_hash(item, memo, depth + 1, result)
+        return result
+    if isinstance(value, dict):
+        result = crc(len(value), seed)
+        for key in sorted(value, key=repr):
+            result = value_hash(value[key], memo, depth + 1, crc(key, result))
+        return result
+    if hasattr(value, "__dict__") and not isinstance(value, Scene):
+        result = crc(type(value).__qualname__, seed)
+        return value_hash(vars(value), memo, depth + 1, result)
+    return crc(type(value).__qualname__, seed)
+
+
+def state_stamp(mobject):
+    # The stamp, plus the keys of the attributes it cannot cover
+    stamp = [id(sub) for sub in mobject.submobjects]
+    stamp += [id(updater) for updater in mobject.updaters]
+    volatile_keys = []
+    for key, value in mobject.__dict__.items():
+        if key in SKIPPED_MOBJECT_KEYS:
+            continue
+        if isinstance(value, np.ndarray):
+            stamp.append((key, crc(value)))
+        elif isinstance(value, SCALAR_TYPES):
+            stamp.append((key, value))
+        elif isinstance(value, ManimColor):
+            stamp.append((key, value.to_hex(with_alpha=True)))
+        elif isinstance(value, Mobject):
+            stamp.append((key, id(value)))
+        else:
+            volatile_keys.append(key)
+    return tuple(stamp), volatile_keys
+
+
+def own_hash(mobject):
+    # Hash of the mobject's own attributes: the stamped part is cached until
+    # the stamp changes, the rest and the updaters are hashed every time
+    stamp, volatile_keys = state_stamp(mobject)
+    cached = mobject.__dict__.get("_play_hash_cache")
+    if cached is not None and cached[0] == stamp:
+        result = cached[1]
+    else:
+        result = crc(type(mobject).__qualname__)
+        for key in sorted(mobject.__dict__):
+            if key in SKIPPED_MOBJECT_KEYS or key in volatile_keys:
+                continue
+            value = mobject.__dict__[key]
+            if isinstance(value, Mobject):
+                # References such as target or saved_state are not drawn
+                result = crc(key, crc(type(value).__qualname__, result))
+            else:
+                result = value_hash(value, {}, 1, crc(key, result))
+        mobject._play_hash_cache = (stamp, result)
+
+    memo = {id(mobject): mobject}
+    for key in sorted(volatile_keys):
+        result = value_hash(mobject.__dict__[key], memo, 1, crc(key, result))
+    for updater in mobject.updaters:
+        result = crc(function_hash(updater, memo, 1), result)
+    return result
+
+
+def family_hash(mobject, memo):
+    # Own hash combined with the family hashes of all submobjects
+    key = ("family", id(mobject))
+    if key in memo:
+        return memo[key]
+    memo[key] = 0  # guards against cycles
+    result = own_hash(mobject)
+    for sub in mobject.submobjects:
+        result = crc(family_hash(sub, memo), result)
+    memo[key] = result
+    return result
+
+
+def camera_hash(camera):
+    result = crc(type(camera).__qualname__)
+    for key in CAMERA_KEYS:
+        result = value_hash(getattr(camera, key, None), {}, 1, crc(key, result))
+    return result
+
+
+def get_incremental_hash_from_play_call(scene_object, camera_object, animations_list, current_mobjects_list):
+    # Same shape as manim's "<camera>_<animations>_<mobjects>" play hash, built
+    # from cached per-mobject hashes instead of JSON-serializing everything
+    memo = {}
+    hash_camera = camera_hash(camera_object)
+    hash_animations = 0
+    for animation in sorted(animations_list, key=str):
+        hash_animations = crc(type(animation).__qualname__, hash_animations)
+        hash_animations = value_hash(vars(animation), memo, 1, hash_animations)
+    hash_current_mobjects = 0
+    for mobject in current_mobjects_list:
+        hash_current_mobjects = crc(family_hash(mobject, memo), hash_current_mobjects)
+    return f"{hash_camera}_{hash_animations}_{hash_current_mobjects}"
+
+
+original_get_hash_from_play_call = cairo_renderer.get_hash_from_play_call
+
+
+def get_hash_from_play_call(scene_object, camera_object, animations_list, current_mobjects_list):
+    if getattr(scene_object.renderer, "incremental_hashing", False):
+        return get_incremental_hash_from_play_call(
+            scene_object, camera_object, animations_list, current_mobjects_list
+        )
+    return original_get_hash_from_play_call(
+        scene_object, camera_object, animations_list, current_mobjects_list
+    )
+
+
+# CairoRenderer.play looks the hash function up in its own module
+cairo_renderer.get_hash_from_play_call = get_hash_from_play_call
+
+
+class IncrementalHashRenderer(CairoRenderer):
+    """CairoRenderer that hashes play calls from cached per-mobject hashes.
+
+    Partial movies hashed this way get different names than with manim's
+    JSON hashing, so switching it on re-renders the cache once.
+    """
+
+    incremental_hashing = True
@@ -0,0 +1,83 @@
+import numpy as np
+from dataclasses import dataclass
+
+
+@dataclass
+class PolygonStats:
+    """Vertices and x/y statistics of a batch of regular polygons.
+
+    Polygons with different side counts are padded to the largest one:
+    ``vertices`` has shape (polygons, max_sides, 3) and ``mask`` marks the
+    real vertices, so row ``i`` holds ``sides[i]`` vertices followed by
+    zeros. Each statistic has one value per polygon.
+    """
+
+    sides: np.ndarray
+    vertices: np.ndarray
+    mask: np.ndarray
+    correlation: np.ndarray
+    slope: np.ndarray
+    intercept: np.ndarray
+    x_min: np.ndarray
+    x_max: np.ndarray
+
+    def __len__(self):
+        return len(self.sides)
+
+    def polygon_vertices(self, index):
+        # Vertices of one polygon without the padding
+        return self.vertices[index, : self.sides[index]]
+
+
+def regular_polygon_stats(sides, rotations=0.0, radii=1.0):
+    """Vertices, correlation and regression line of x against y for regular polygons.
+
+    ``sides``, ``rotations`` (radians) and ``radii`` broadcast against each
+    other, one entry per polygon. Vertex ``k`` of an n-gon sits at angle
+    ``rotation + 2*pi*k/n``. The statistics match ``np.corrcoef`` and
+    ``scipy.stats.linregress`` on each polygon's vertices and are computed
+    for all polygons at once with masked sums over the padded vertex array;
+    they are NaN where a polygon's x or y has no variance.
+    """
+    sides, rotations, radii = np.broadcast_arrays(
+        np.asarray(sides, dtype=int),
+        np.asarray(rotations, dtype=float),
+        np.asarray(radii, dtype=float),
+    )
+    sides, rotations, radii = sides.ravel(), rotations.ravel(), radii.ravel()
+    if np.any(sides < 1):
+        raise ValueError("A polygon needs at least one vertex")
+    max_sides = sides.max() if len(sides) else 0
+
+    k = np.arange(max_sides)
+    mask = k < sides[:, None]
+    angles = rotations[:, None] + 2 * np.pi * k / sides[:, None]
+    vertices = np.zeros((len(sides), max_sides, 3))
+    vertices[..., 0] = np.where(mask, radii[:, None] * np.cos(angles), 0)
+    vertices[..., 1] = np.where(mask, radii[:, None] * np.sin(angles), 0)
+    x, y = vertices[..., 0], vertices[..., 1]
+
+    # Padded entries are zero, so plain sums only see the real vertices once
+    # the means are subtracted under the mask
+    count = sides.astype(float)
+    dx = np.where(mask, x - (x.sum(axis=1) / count)[:, None], 0)
+    dy = np.where(mask, y - (y.sum(axis=1) / count)[:, None], 0)
+    sxx = (dx * dx).sum(axis=1)
+    syy = (dy * dy).sum(axis=1)
+    sxy = (dx * dy).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = np.clip(sxy / np.sqrt(sxx * syy), -1, 1)
+        slope = sxy / sxx
+    intercept = y.sum(axis=1) / count - slope * x.sum(axis=1) / count
+
+    return PolygonStats(
+        sides=sides,
+        vertices=vertices,
+        mask=mask,
+        correlation=correlation,
+        slope=slope,
+        intercept=intercept,
+        x_min=np.where(mask, x, np.inf).min(axis=1, initial=np.inf),
+        x_max=np.where(mask, x, -np.inf).max(axis=1, initial=-np.inf),
+    )
@@ -1,21 +1,133 @@
 #!/usr/bin/env python
 import argparse
+import sys
+from functools import partial
+
+if __name__ == "__main__" and "--daemon" in sys.argv[1:]:
+    # Hand the render to a running render_daemon.py before importing manim
+    from render_daemon import submit_render
+    sys.exit(submit_render(sys.argv[1:]))
+
 from manim import *
 from complex_unity_correlation import ComplexUnityCorrelation
+from parallel_render import render_parallel
+from tex_batch import prefetch_scene_tex
+from tex_format import use_precompiled_preamble
+from av_writer import AVSceneFileWriter, av_imported
+from threaded_writer import PipelinedCairoRenderer, ThreadedFrameWriter
+from frame_hold import FrameHoldRenderer, FrameHoldWriter
+from dirty_camera import DirtyRectCamera
+from estimate import EstimateRenderer, estimate_render
+from render_manifest import ManifestRenderer, ManifestWriter
+from play_hashing import IncrementalHashRenderer
+from ladder_writer import LADDER_RUNGS, LadderWriter
+from fast_forward import FastForwardRenderer
+from scene_snapshot import section_label, snapshot_file
+from asset_store import ASSET_STORE_ENV, AssetStoreWriter
+from cache_index import IndexedCacheWriter, cache_command, parse_size
+import svg_cache  # keeps parsed Tex SVGs between runs
+import text_cache  # keeps Text outlines between runs, skipping Pango
+import os
 
-def main():
+def make_renderer(args):
+    # Cairo renderer whose file writer combines the backends chosen on the
+    # command line. Called in each worker process, so the classes are built
+    # there and never have to be pickled.
+    writer_bases = [AVSceneFileWriter if args.encoder == 'av' else SceneFileWriter]
+    writer_attrs = {}
+    renderer_bases = [CairoRenderer]
+    renderer_attrs = {}
+    # Every rung of the ladder needs the frames of a hold, so the two are
+    # not combined
+    if args.ladder:
+        writer_bases.insert(0, LadderWriter)
+    elif args.frame_hold:
+        writer_bases.insert(0, FrameHoldWriter)
+        renderer_bases.insert(0, FrameHoldRenderer)
+    if args.frame_queue > 0:
+        writer_bases.insert(0, ThreadedFrameWriter)
+        writer_attrs['queue_depth'] = args.frame_queue
+        renderer_bases.insert(0, PipelinedCairoRenderer)
+    if args.fast_hash:
+        renderer_bases.insert(0, IncrementalHashRenderer)
+    if args.plays:
+        renderer_bases.insert(0, FastForwardRenderer)
+    if args.estimate:
+        renderer_bases.insert(0, EstimateRenderer)
+    else:
+        # An estimate must not replace the manifest of an interrupted render
+        writer_bases.insert(0, ManifestWriter)
+        renderer_bases.insert(0, ManifestRenderer)
+        renderer_attrs['resume'] = args.resume
+        writer_bases.insert(0, IndexedCacheWriter)
+        writer_attrs['cache_budget'] = args.cache_budget
+    if os.environ.get(ASSET_STORE_ENV):
+        writer_bases.insert(0, AssetStoreWriter)
+    file_writer_class = type('SceneFileWriter', tuple(writer_bases), writer_attrs)
+    renderer_class = type('CairoRenderer', tuple(renderer_bases), renderer_attrs)
+    camera_class = DirtyRectCamera if args.dirty_rects else Camera
+    return renderer_class(file_writer_class=file_writer_class, camera_class=camera_class)
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ['cache']:
+        # render.py cache stats|prune, on the cache under ./videos
+        config.media_dir = "./videos"
+        cache_command(argv[1:])
+        return
+    
     parser = argparse.ArgumentParser(description='Render Manim animations for complex roots of unity.')
     parser.add_argument('--scene', type=str, choices=['complex_unity', 'all'], 
                         default='complex_unity', help='Which scene to render')
     parser.add_argument('--quality', type=str, choices=['low', 'medium', 'high'], 
                         default='medium', help='Rendering quality')
     parser.add_argument('--preview', action='store_true', help='Open the rendered video after completion')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Render scene segments in N worker processes and concatenate them')
+    parser.add_argument('--batch-tex', action='store_true',
+                        help='Compile all uncached Tex/MathTex and Text on a process pool before rendering')
+    parser.add_argument('--no-tex-format', dest='tex_format', action='store_false',
+                        help='Compile every Tex/MathTex with its full preamble instead of a precompiled format')
+    parser.add_argument('--encoder', type=str, choices=['ffmpeg', 'av'], default='ffmpeg',
+                        help='Encode partial movies through an ffmpeg pipe or in-process with PyAV')
+    parser.add_argument('--frame-queue', type=int, default=0,
+                        help='Encode frames on a background thread with a queue of N frame buffers (0 = synchronous)')
+    parser.add_argument('--no-frame-hold', dest='frame_hold', action='store_false',
+                        help='Pipe every frame of a wait() instead of letting the encoder repeat one frame')
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help='Only clear and redraw the part of the frame covered by moving mobjects')
+    parser.add_argument('--fast-hash', action='store_true',
+                        help='Hash play calls from cached per-mobject hashes instead of serializing the whole scene')
+    parser.add_argument('--estimate', action='store_true',
+                        help='Dry-run the scene and predict how long rendering it would take instead of rendering')
+    parser.add_argument('--resume', action='store_true',
+                        help='Reuse the plays a previous, interrupted render finished instead of hashing them again')
+    parser.add_argument('--ladder', action='store_true',
+                        help='Render once at high quality and encode the medium and low renditions from the same frames')
+    parser.add_argument('--plays', type=str, default=None,
+                        help='Only render plays A to B (inclusive, e.g. 0-40 or 41-), fast-forwarding through the earlier ones')
+    parser.add_argument('--snapshots', action='store_true',
+                        help='Save the scene state at the start of every section under videos/snapshots')
+    parser.add_argument('--from-section', type=str, default=None,
+                        choices=ComplexUnityCorrelation.segments,
+                        help='Restore the snapshot saved by --snapshots and only render from this section on')
+    parser.add_argument('--asset-store', type=str, default=os.environ.get(ASSET_STORE_ENV),
+                        help=f'Share Tex/Text SVGs and partial movies through a content-addressed store in this directory (default: ${ASSET_STORE_ENV})')
+    parser.add_argument('--cache-budget', type=parse_size, default=None,
+                        help='After rendering, evict the least recently used cached files beyond this total size (e.g. 5G)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Send the render to a running render_daemon.py instead of rendering in this process')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Set configuration based on arguments
     config.media_dir = "./videos"
     
+    if args.asset_store:
+        # Through the environment, so worker processes use the same store
+        os.environ[ASSET_STORE_ENV] = args.asset_store
+    
     # Set background color to ensure borders are visible
     config.background_color = "#000000"
     
@@ -28,11 +140,45 @@ def main():
         config.pixel_height = 720
         config.pixel_width = 1280
         config.frame_rate = 30
-    else:  # high
+    else:  # high (the top of the --ladder)
+        config.pixel_height = 1080
+        config.pixel_width = 1920
+        config.frame_rate = 60
+    
+    if args.ladder and args.quality != 'high':
+        print("--ladder renders at high quality and derives the lower qualities from it")
         config.pixel_height = 1080
         config.pixel_width = 1920
         config.frame_rate = 60
     
+    if args.plays:
+        # One shard of the scene: its own output file and partial movie
+        # directory, so shards can render side by side
+        start, _, end = args.plays.partition('-')
+        config.from_animation_number = int(start or 0)
+        config.upto_animation_number = int(end) if end else -1
+        config.output_file = f"ComplexUnityCorrelation_plays_{args.plays}"
+        config.partial_movie_dir = f"{{video_dir}}/partial_movie_files/{{scene_name}}/plays_{args.plays}"
+        if args.jobs > 1:
+            print("--plays renders its range in one process, ignoring --jobs")
+            args.jobs = 1
+    
+    scene_kwargs = {'save_snapshots': args.snapshots}
+    if args.from_section:
+        # Start from the state the earlier sections left behind instead of
+        # rendering them, into its own output file
+        index = ComplexUnityCorrelation.segments.index(args.from_section)
+        scene_kwargs['segments'] = ComplexUnityCorrelation.segments[index:]
+        scene_kwargs['snapshot_file'] = snapshot_file('ComplexUnityCorrelation', section_label(index, args.from_section))
+        if not scene_kwargs['snapshot_file'].exists():
+            print(f"No snapshot of section {args.from_section}, render with --snapshots first")
+            return
+        config.output_file = f"ComplexUnityCorrelation_from_{args.from_section}"
+        config.partial_movie_dir = f"{{video_dir}}/partial_movie_files/{{scene_name}}/from_{args.from_section}"
+    if (args.snapshots or args.from_section) and args.jobs > 1:
+        print("Scene snapshots follow the sections of one process, ignoring --jobs")
+        args.jobs = 1
+    
     # Set preview flag
     config.preview = args.preview
     
@@ -41,11 +187,31 @@ def main():
     config.frame_height = 8.0
     config.frame_width = config.frame_height * 16/9  # Maintain 16:9 aspect ratio
     
+    # Load the TeX preamble from a precompiled format instead of re-parsing it
+    # for every expression
+    if args.tex_format:
+        use_precompiled_preamble()
+    
+    if args.encoder == 'av' and not av_imported:
+        print("PyAV is not installed, falling back to the ffmpeg encoder")
+    renderer_factory = partial(make_renderer, args)
+    
     # Render the requested scenes
+    if args.scene in ['complex_unity', 'all'] and args.estimate:
+        print("Estimating complex unity correlation scene...")
+        estimate_render(ComplexUnityCorrelation, renderer_factory())
+        return
+    
     if args.scene in ['complex_unity', 'all']:
+        if args.batch_tex:
+            prefetch_scene_tex(ComplexUnityCorrelation)
         print("Rendering complex unity correlation scene...")
-        scene = ComplexUnityCorrelation()
-        scene.render()
+        if args.jobs > 1:
+            render_parallel(ComplexUnityCorrelation, args.jobs, renderer_factory,
+                            rungs=LADDER_RUNGS if args.ladder else ())
+        else:
+            scene = ComplexUnityCorrelation(renderer=renderer_factory(), **scene_kwargs)
+            scene.render()
     
     print("Rendering complete. Videos saved to ./videos directory.")
 
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# Long-lived render server. It imports manim and the heavy libraries once,
+# then renders every request in a forked child, so the child starts warm.
+# Start it with `python render_daemon.py` and send renders with
+# `python render.py --daemon ...`.
+import argparse
+import importlib
+import io
+import os
+import sys
+import tempfile
+import traceback
+from multiprocessing import get_context
+from multiprocessing.connection import Client, Listener
+
+if sys.platform == "win32":
+    DAEMON_ADDRESS = r"\\.\pipe\manim-render-daemon"
+else:
+    DAEMON_ADDRESS = os.path.join(tempfile.gettempdir(), f"manim-render-daemon-{os.getuid()}.sock")
+
+# Shared secret of the daemon and its clients, readable only by this user
+AUTHKEY_FILE = os.path.join(os.path.expanduser("~"), ".manim_render_daemon_key")
+
+
+def daemon_authkey(create=False):
+    if create and not os.path.exists(AUTHKEY_FILE):
+        fd = os.open(AUTHKEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as key_file:
+            key_file.write(os.urandom(32))
+    with open(AUTHKEY_FILE, "rb") as key_file:
+        return key_file.read()
+
+
+def submit_render(argv=None, module=None, scene=None, config_overrides=None):
+    """Send a render to the daemon and print its output as it arrives.
+
+    Either ``argv`` (render.py's command line) or ``module`` and ``scene``
+    (plus optional manim ``config_overrides``) describe the render. Returns
+    the process exit code. Only the standard library is imported here.
+    """
+    request = {"cwd": os.getcwd()}
+    if module is not None:
+        request.update(module=module, scene=scene, config=config_overrides or {})
+    else:
+        request["argv"] = [arg for arg in argv if arg != "--daemon"]
+
+    try:
+        connection = Client(DAEMON_ADDRESS, authkey=daemon_authkey())
+    except (OSError, EOFError):
+        print("No render daemon is running, start one with: python render_daemon.py")
+        return 1
+    with connection:
+        connection.send(request)
+        progress_line = ""
+        while True:
+            try:
+                kind, payload = connection.recv()
+            except EOFError:
+                print("The render daemon closed the connection")
+                return 1
+            if kind == "output":
+                print(payload, end="", flush=True)
+            elif kind == "progress":
+                # One line per animation, redrawn in place like manim's bar
+                line = f"{payload['desc']}: {payload['n']}/{payload['total']}"
+                if payload["total"]:
+                    line = f"{payload['desc']}: {100 * payload['n'] // payload['total']:3d}% {payload['n']}/{payload['total']}"
+                print("\r" + line.ljust(len(progress_line)), end="", flush=True)
+                progress_line = line
+                if payload["closed"]:
+                    print("\n" if payload["leave"] else "\r" + " " * len(line) + "\r", end="", flush=True)
+                    progress_line = ""
+            elif kind == "done":
+                return 0
+            elif kind == "error":
+                print(payload, end="", file=sys.stderr)
+                return 1
+
+
+class ConnectionStream:
+    # File-like object that forwards writes (print, logging) to the client
+    def __init__(self, connection):
+        self.connection = connection
+
+    def write(self, text):
+        if text:
+            self.connection.send(("output", text))
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def connection_progress_class(connection):
+    # tqdm as manim's Scene uses it for each animation's progress bar, sending
+    # its state to the client instead of drawing the bar itself
+    from tqdm import tqdm
+
+    class ConnectionProgress(tqdm):
+        def __init__(self, *args, **kwargs):
+            kwargs["file"] = io.StringIO()
+            super().__init__(*args, **kwargs)
+
+        def send_progress(self, closed):
+            connection.send(
+                (
+                    "progress",
+                    {"desc": self.desc, "n": self.n, "total": self.total, "leave": bool(self.leave), "closed": closed},
+                )
+            )
+
+        def display(self, msg=None, pos=None):
+            # Called by tqdm at most every mininterval, and on close
+            self.send_progress(closed=False)
+            return True
+
+        def close(self):
+            disabled = self.disable
+            super().close()
+            if not disabled:
+                self.send_progress(closed=True)
+
+    return ConnectionProgress
+
+
+def project_modules(cwd):
+    # Modules imported from the client's directory, i.e. the scene code
+    cwd = os.path.normcase(os.path.abspath(cwd))
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if name in ("__main__", __name__):
+            continue
+        if path and os.path.normcase(os.path.abspath(path)).startswith(cwd + os.sep):
+            yield name
+
+
+def run_request(request, connection):
+    # Runs in the forked child, or in the daemon itself where fork is missing
+    # manim's rich console writes to whatever sys.stdout is at the time
+    sys.stdout = sys.stderr = ConnectionStream(connection)
+    from manim.scene import scene as scene_module
+
+    original_tqdm = scene_module.tqdm
+    try:
+        from manim import config, tempconfig
+
+        scene_module.tqdm = connection_progress_class(connection)
+        os.chdir(request["cwd"])
+        if request["cwd"] not in sys.path:
+            sys.path.insert(0, request["cwd"])
+        # Always run the scene code as it is on disk now
+        for name in list(project_modules(request["cwd"])):
+            del sys.modules[name]
+
+        # Config changes end with the request, also without fork
+        with tempconfig({}):
+            if "argv" in request:
+                importlib.import_module("render").main(request["argv"])
+            else:
+                for key, value in request["config"].items():
+                    config[key] = value
+                scene_class = getattr(importlib.import_module(request["module"]), request["scene"])
+                scene_class().render()
+        connection.send(("done", None))
+    except BaseException:
+        connection.send(("error", traceback.format_exc()))
+    finally:
+        scene_module.tqdm = original_tqdm
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+
+
+def warm_up():
+    # Everything a render would otherwise import or discover on its own
+    print("Importing manim...")
+    import manim  # noqa: F401
+    import numpy  # noqa: F401
+    import scipy.stats  # noqa: F401
+
+    try:
+        import manimpango
+
+        manimpango.list_fonts()
+    except ImportError:
+        pass
+
+
+def hooked_attributes():
+    # Attributes of manim that project modules replace when imported
+    from manim.mobject.svg.svg_mobject import SVGMobject
+    from manim.mobject.text import tex_mobject
+    from manim.mobject.text.text_mobject import Text
+    from manim.renderer import cairo_renderer
+
+    return [
+        (tex_mobject, "tex_to_svg_file"),
+        (cairo_renderer, "get_hash_from_play_call"),
+        (SVGMobject, "init_svg_mobject"),
+        (Text, "_text2svg"),
+    ]
+
+
+def serve():
+    warm_up()
+    originals = [(owner, name, getattr(owner, name)) for owner, name in hooked_attributes()]
+    can_fork = hasattr(os, "fork")
+    if sys.platform != "win32" and os.path.exists(DAEMON_ADDRESS):
+        os.unlink(DAEMON_ADDRESS)
+
+    with Listener(DAEMON_ADDRESS, authkey=daemon_authkey(create=True)) as listener:
+        print(f"Render daemon listening on {DAEMON_ADDRESS}")
+        while True:
+            try:
+                connection = listener.accept()
+            except (OSError, EOFError) as error:
+                # A client that failed authentication or went away
+                print(f"Rejected connection: {error}")
+                continue
+            with connection:
+                try:
+                    request = connection.recv()
+                except EOFError:
+                    continue
+                print(f"Rendering {request.get('argv') or request.get('scene')} in {request['cwd']}")
+                if can_fork:
+                    child = get_context("fork").Process(target=run_request, args=(request, connection))
+                    child.start()
+                    child.join()
+                    if child.exitcode:
+                        connection.send(("error", f"Render process exited with code {child.exitcode}\n"))
+                else:
+                    cwd = os.getcwd()
+                    run_request(request, connection)
+                    os.chdir(cwd)
+                    # Let the next request's imports wrap manim's originals again
+                    for owner, name, original in originals:
+                        setattr(owner, name, original)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep manim imported and render scenes on request.')
+    parser.add_argument('--module', type=str, help='Send a render of SCENE from this module to the running daemon')
+    parser.add_argument('--scene', type=str, help='Scene class to render with --module')
+    args = parser.parse_args()
+    if args.module is not None:
+        sys.exit(submit_render(module=args.module, scene=args.scene))
+    serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+from manim import *
+from pathlib import Path
+import hashlib
+import inspect
+import json
+import os
+
+# Statuses of a play whose partial movie is complete (or that has none)
+FINISHED_STATUSES = {"done", "cached", "skipped"}
+
+
+class ManifestWriter:
+    """File writer mixin that records every play in a checkpoint manifest.
+
+    ``manifest.json`` next to the partial movies lists, per play, its hash,
+    partial movie file, frame count and status: ``pending`` while it is being
+    written, ``done`` once its movie is closed, ``cached`` when an existing
+    movie was reused and ``skipped`` when it has none. The file is rewritten
+    atomically after every change, so after a crash it describes exactly the
+    plays that finished. While resuming, entries of the previous run are
+    kept until their play is recorded again.
+    """
+
+    def start_manifest(self, signature, resume=False):
+        if not hasattr(self, "partial_movie_directory"):
+            self.manifest_file = None
+            return
+        self.manifest_file = Path(self.partial_movie_directory) / "manifest.json"
+        self.manifest_signature = signature
+        self.manifest_plays = []
+        self.resume_plays = self.finished_prefix() if resume else []
+        if self.resume_plays:
+            logger.info(f"Resuming after {len(self.resume_plays)} finished plays from {self.manifest_file}")
+        self.save_manifest()
+
+    def finished_prefix(self):
+        # Leading plays of the previous run that can be trusted: same scene
+        # and settings, finished, and their movie still on disk
+        try:
+            manifest = json.loads(self.manifest_file.read_text())
+        except (OSError, ValueError):
+            return []
+        plays = manifest.get("plays", [])
+        for play in plays:
+            # A play that did not finish may have left a truncated movie
+            # behind, which the cache would take for a complete one
+            if play["status"] not in FINISHED_STATUSES and play["file"] is not None:
+                Path(play["file"]).unlink(missing_ok=True)
+        if manifest.get("signature") != self.manifest_signature:
+            logger.info("Render manifest belongs to different settings, not resuming")
+            return []
+        prefix = []
+        for play in plays:
+            if play["status"] not in FINISHED_STATUSES:
+                break
+            if play["file"] is not None and not Path(play["file"]).exists():
+                break
+            prefix.append(play)
+        return prefix
+
+    def resumed_play(self, index):
+        # The previous run's entry for this play, if it can be trusted
+        if getattr(self, "manifest_file", None) is None or index >= len(self.resume_plays):
+            return None
+        return self.resume_plays[index]
+
+    def save_manifest(self):
+        # Resumed plays not recorded yet keep their entries, so a crash
+        # before they are reached does not lose them
+        plays = self.manifest_plays + self.resume_plays[len(self.manifest_plays) :]
+        manifest = {"signature": self.manifest_signature, "plays": plays}
+        temp_file = self.manifest_file.with_name(f"manifest_{os.getpid()}.tmp")
+        temp_file.write_text(json.dumps(manifest, indent=1))
+        os.replace(temp_file, self.manifest_file)
+
+    def add_partial_movie_file(self, hash_animation):
+        super().add_partial_movie_file(hash_animation)
+        if getattr(self, "manifest_file", None) is None or len(self.partial_movie_files) == len(self.manifest_plays):
+            return
+        if hash_animation is None:
+            status = "skipped"
+        elif self.renderer.skip_animations:
+            status = "cached"
+        else:
+            status = "pending"
+        self.manifest_plays.append(
+            {
+                "play": len(self.manifest_plays),
+                "hash": hash_animation,
+                "file": self.partial_movie_files[-1],
+                "frames": None,
+                "status": status,
+            }
+        )
+        self.save_manifest()
+
+    def add_resumed_partial_movie_file(self, play):
+        # Re-record a finished play of the previous run as it was
+        self.add_partial_movie_file(play["hash"])
+        self.manifest_plays[-1]["frames"] = play["frames"]
+        self.save_manifest()
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        self.play_start_time = self.renderer.time
+        super().begin_animation(allow_write=allow_write, file_path=file_path)
+
+    def end_animation(self, allow_write=False):
+        super().end_animation(allow_write=allow_write)
+        if getattr(self, "manifest_file", None) is None or not self.manifest_plays:
+            return
+        play = self.manifest_plays[-1]
+        if play["status"] == "pending":
+            # renderer.time advances by one frame interval per written frame
+            play["frames"] = round((self.renderer.time - self.play_start_time) * config["frame_rate"])
+            play["status"] = "done"
+            self.save_manifest()
+
+
+class ManifestRenderer(CairoRenderer):
+    """CairoRenderer that keeps a ManifestWriter's manifest and can resume from it.
+
+    With ``resume`` set, plays that the previous run's manifest lists as
+    finished are fast-forwarded: the scene state is advanced as for a skipped
+    play, but the recorded hash and partial movie are reused instead of
+    hashing the play and looking it up in the cache again. The first play
+    that did not finish, and everything after it, render as usual.
+    """
+
+    resume = False
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        start_manifest = getattr(self.file_writer, "start_manifest", None)
+        if start_manifest is not None:
+            start_manifest(self.manifest_signature(scene), resume=self.resume)
+
+    def manifest_signature(self, scene):
+        # A manifest is only reused for the same scene code and output settings
+        try:
+            source = inspect.getsource(type(scene))
+        except (OSError, TypeError):
+            source = type(scene).__name__
+        return {
+            "scene": type(scene).__name__,
+            "segments": list(getattr(scene, "segments", [])),
+            "source": hashlib.sha256(source.encode()).hexdigest(),
+            "resolution": [config["pixel_width"], config["pixel_height"]],
+            "frame_rate": config["frame_rate"],
+            "disable_caching": config["disable_caching"],
+        }
+
+    def play(self, scene, *args, **kwargs):
+        resumed_play = getattr(self.file_writer, "resumed_play", None)
+        play = resumed_play(self.num_plays) if resumed_play is not None else None
+        if play is None:
+            return super().play(scene, *args, **kwargs)
+
+        # The skipping branch of CairoRenderer.play with the recorded hash;
+        # the static frame is not needed since nothing is drawn. The movie is
+        # added at the play's start time, as for a play that is rendered
+        self.skip_animations = True
+        scene.compile_animation_data(*args, **kwargs)
+        self.file_writer.add_resumed_partial_movie_file(play)
+        self.time += scene.duration
+        self.animations_hashes.append(play["hash"])
+        logger.info(f"Animation {self.num_plays} : Resumed from the render manifest")
+
+        self.file_writer.begin_animation(False)
+        scene.begin_animations()
+        if not scene.is_current_animation_frozen_frame():
+            scene.play_internal()
+        self.file_writer.end_animation(False)
+        self.num_plays += 1
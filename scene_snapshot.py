@@ -0,0 +1,156 @@
+from manim import *
+from pathlib import Path
+import io
+import os
+import pickle
+import random
+import numpy as np
+
+# Camera settings a construct may change and a snapshot has to carry
+CAMERA_STATE = ("frame_center", "frame_width", "frame_height", "background_color", "background_opacity")
+
+
+class ArrayPickler(pickle.Pickler):
+    # Pickles the object graph, but hands numeric numpy arrays (VMobject
+    # points, rgbas, ...) out as raw arrays instead of pickling them
+    def __init__(self, file, arrays):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays = arrays
+        self.array_ids = {}
+
+    def persistent_id(self, obj):
+        if type(obj) is not np.ndarray or obj.dtype.kind not in "biufc":
+            return None
+        if id(obj) not in self.array_ids:
+            self.array_ids[id(obj)] = len(self.arrays)
+            self.arrays.append(obj)
+        return self.array_ids[id(obj)]
+
+
+class ArrayUnpickler(pickle.Unpickler):
+    def __init__(self, file, arrays):
+        super().__init__(file)
+        self.arrays = arrays
+
+    def persistent_load(self, pid):
+        return self.arrays[pid]
+
+
+def snapshot_file(scene_name, label):
+    # media_dir/snapshots/<Scene>/<label>.npz
+    return Path(config.get_dir("media_dir")) / "snapshots" / scene_name / f"{label}.npz"
+
+
+def section_label(index, name):
+    return f"section_{index:02d}_{name}"
+
+
+def write_snapshot(path, state):
+    """Write ``state`` to ``path`` as an .npz of raw arrays plus the pickled
+    graph that refers to them; arrays shared between objects are stored once."""
+    arrays = []
+    graph = io.BytesIO()
+    ArrayPickler(graph, arrays).dump(state)
+    data = {f"a{index}": array for index, array in enumerate(arrays)}
+    data["graph"] = np.frombuffer(graph.getvalue(), dtype=np.uint8)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = path.with_name(f"{path.stem}_{os.getpid()}.tmp")
+    with open(temp_file, "wb") as file:
+        np.savez(file, **data)
+    os.replace(temp_file, path)
+
+
+def read_snapshot(path):
+    with np.load(path) as data:
+        arrays = [data[f"a{index}"] for index in range(len(data.files) - 1)]
+        graph = data["graph"].tobytes()
+    return ArrayUnpickler(io.BytesIO(graph), arrays).load()
+
+
+class SnapshotScene(Scene):
+    """Scene that can save its state at section boundaries and start from it.
+
+    With ``save_snapshots`` set, every ``next_section`` (and every play index
+    in ``snapshot_plays``) writes the mobjects, foreground mobjects,
+    attributes set since ``__init__`` (e.g. in ``setup``), camera settings,
+    renderer time and play count, and the random generators' state to
+    ``snapshot_file(...)``. Given ``snapshot_file``, ``setup`` restores that
+    state, so a worker can continue from there instead of replaying the
+    plays before it. Subclasses that override ``setup`` call
+    ``super().setup()`` last.
+
+    Python cannot re-enter ``construct`` halfway through a method, so a
+    worker continues from a section snapshot by running only the sections
+    from there on. Play snapshots hold the same state for tools that pick it
+    up directly.
+
+    Mobjects with updaters defined as lambdas cannot be pickled; such a
+    snapshot is skipped with a warning.
+    """
+
+    def __init__(self, snapshot_file=None, save_snapshots=False, snapshot_plays=(), **kwargs):
+        super().__init__(**kwargs)
+        self.snapshot_file = snapshot_file
+        self.save_snapshots = save_snapshots
+        self.snapshot_plays = set(snapshot_plays)
+        self.section_count = 0
+        # Everything set from here on is scene state
+        self.scene_base_keys = set(vars(self))
+
+    def get_snapshot_state(self):
+        return {
+            "mobjects": self.mobjects,
+            "foreground_mobjects": self.foreground_mobjects,
+            "attributes": {key: value for key, value in vars(self).items() if key not in self.scene_base_keys},
+            "camera": {key: getattr(self.renderer.camera, key) for key in CAMERA_STATE},
+            "time": self.renderer.time,
+            "num_plays": self.renderer.num_plays,
+            "section_count": self.section_count,
+            "random": (random.getstate(), np.random.get_state()),
+        }
+
+    def save_snapshot(self, label):
+        path = snapshot_file(type(self).__name__, label)
+        try:
+            write_snapshot(path, self.get_snapshot_state())
+        except (pickle.PicklingError, AttributeError, TypeError) as error:
+            logger.warning(f"Could not save scene snapshot {label}: {error}")
+            return None
+        logger.info(f"Saved scene snapshot {path}")
+        return path
+
+    def restore_snapshot(self, path):
+        state = read_snapshot(path)
+        for key, value in state["attributes"].items():
+            setattr(self, key, value)
+        self.mobjects = state["mobjects"]
+        self.foreground_mobjects = state["foreground_mobjects"]
+        for key, value in state["camera"].items():
+            setattr(self.renderer.camera, key, value)
+        self.renderer.time = state["time"]
+        # Keep partial movie indices in step with the restored play count
+        for _ in range(state["num_plays"]):
+            self.renderer.file_writer.add_partial_movie_file(None)
+        self.renderer.num_plays = state["num_plays"]
+        self.section_count = state["section_count"]
+        random.setstate(state["random"][0])
+        np.random.set_state(state["random"][1])
+        logger.info(f"Restored scene snapshot {path} at play {state['num_plays']}")
+
+    def setup(self):
+        super().setup()
+        if self.snapshot_file is not None:
+            self.restore_snapshot(self.snapshot_file)
+
+    def next_section(self, name="unnamed", type=DefaultSectionType.NORMAL, skip_animations=False):
+        if self.save_snapshots:
+            self.save_snapshot(section_label(self.section_count, name))
+        self.section_count += 1
+        super().next_section(name, type, skip_animations)
+
+    def play(self, *args, **kwargs):
+        if self.save_snapshots and self.renderer.num_plays in self.snapshot_plays:
+            self.save_snapshot(f"play_{self.renderer.num_plays:04d}")
+        super().play(*args, **kwargs)
@@ -0,0 +1,118 @@
+from manim import *
+from manim.mobject.svg.svg_mobject import SVG_HASH_TO_MOB_MAP
+from manim.utils.iterables import hash_obj
+from pathlib import Path
+import hashlib
+import numpy as np
+import os
+
+# Per-submobject arrays that make up a parsed SVG. Everything else a
+# VMobject needs is rebuilt from these.
+ARRAY_KEYS = ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas")
+SCALAR_KEYS = (
+    "stroke_width",
+    "background_stroke_width",
+    "fill_opacity",
+    "stroke_opacity",
+    "sheen_factor",
+)
+
+
+def svg_cache_file(svg_mobject):
+    # Keyed by the SVG's content rather than its path, plus the arguments
+    # that change how it is parsed
+    with open(svg_mobject.get_file_path(), "rb") as svg_file:
+        digest = hashlib.sha256(svg_file.read())
+    digest.update(
+        repr(
+            (
+                type(svg_mobject).__name__,
+                svg_mobject.svg_default,
+                svg_mobject.path_string_config,
+            )
+        ).encode()
+    )
+    cache_dir = Path(config.get_dir("media_dir")) / "svg_cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / f"{digest.hexdigest()[:32]}.npz"
+
+
+def save_svg_arrays(cache_file, submobjects):
+    # One concatenated array per key plus the offsets that split it again
+    data = {}
+    for key in ARRAY_KEYS:
+        arrays = [getattr(mob, key) for mob in submobjects]
+        data[key] = np.concatenate(arrays) if arrays else np.zeros((0, 3 if key == "points" else 4))
+        data[f"{key}_offsets"] = np.cumsum([0] + [len(array) for array in arrays])
+    for key in SCALAR_KEYS:
+        data[key] = np.array([getattr(mob, key) for mob in submobjects], dtype=float)
+    data["sheen_direction"] = np.array([mob.sheen_direction for mob in submobjects], dtype=float).reshape(-1, 3)
+
+    # Written under a per-process name and moved into place, so parallel
+    # workers never load a half-written archive
+    temp_file = cache_file.with_name(f"{cache_file.stem}_{os.getpid()}.tmp")
+    with open(temp_file, "wb") as file:
+        np.savez(file, **data)
+    os.replace(temp_file, cache_file)
+
+
+def load_svg_arrays(cache_file):
+    # Plain VMobjects carrying the stored points and styles; no XML is parsed
+    with np.load(cache_file) as data:
+        data = {key: data[key] for key in data.files}
+    submobjects = []
+    for index in range(len(data["stroke_width"])):
+        mob = VMobject()
+        for key in ARRAY_KEYS:
+            start, end = data[f"{key}_offsets"][index : index + 2]
+            setattr(mob, key, data[key][start:end].copy())
+        for key in SCALAR_KEYS:
+            setattr(mob, key, float(data[key][index]))
+        mob.sheen_direction = data["sheen_direction"][index].copy()
+        submobjects.append(mob)
+    return submobjects
+
+
+def can_store(submobjects):
+    # Only flat lists of VMobjects are reduced to arrays
+    return all(type(mob).get_mobject_type_class() is VMobject and not mob.submobjects for mob in submobjects)
+
+
+original_init_svg_mobject = SVGMobject.init_svg_mobject
+
+
+def init_svg_mobject(self, use_svg_cache):
+    # Same as SVGMobject.init_svg_mobject, with a persistent store behind the
+    # in-memory SVG_HASH_TO_MOB_MAP
+    if not use_svg_cache or config.renderer != RendererType.CAIRO:
+        return original_init_svg_mobject(self, use_svg_cache)
+
+    hash_val = hash_obj(self.hash_seed)
+    if hash_val in SVG_HASH_TO_MOB_MAP:
+        mob = SVG_HASH_TO_MOB_MAP[hash_val].copy()
+        self.add(*mob)
+        return
+
+    cache_file = svg_cache_file(self)
+    submobjects = None
+    if cache_file.exists():
+        try:
+            submobjects = load_svg_arrays(cache_file)
+        except Exception as error:
+            logger.warning(f"Ignoring unreadable SVG cache file {cache_file}: {error}")
+    if submobjects is None:
+        self.generate_mobject()
+        if can_store(self.submobjects):
+            save_svg_arrays(cache_file, self.submobjects)
+            # Continue with what a warm run would load, so cold and warm runs
+            # build identical mobjects (and hash to the same partial movies)
+            submobjects = load_svg_arrays(cache_file)
+            self.remove(*self.submobjects)
+    if submobjects is not None:
+        self.add(*submobjects)
+    SVG_HASH_TO_MOB_MAP[hash_val] = self.copy()
+
+
+# Installed on import, like the Tex hook in tex_format, so worker processes
+# that import this module use the store as well
+SVGMobject.init_svg_mobject = init_svg_mobject
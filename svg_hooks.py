@@ -0,0 +1,99 @@
+from manim import *
+from manim.mobject.text import tex_mobject
+from manim.utils.tex_file_writing import compile_tex, convert_to_svg, delete_nonsvg_files, generate_tex_file
+from check_tex_template import ensure_latex
+
+# The one place where manim's Tex compile and Text Pango steps are replaced.
+# The caches register callbacks here instead of each wrapping the manim
+# functions again, so what runs does not depend on which module was
+# imported first:
+# - ``before(kind, svg_file)`` runs while the SVG is missing, before it is
+#   produced, and may put it in place (the asset store fetches it)
+# - ``after(kind, svg_file)`` runs for every SVG handed out, cached or not
+# - ``defer(text, color)`` runs first for every Text and may return a file
+#   to use instead, skipping the rest (the Text cache puts Pango off)
+# ``kind`` is "tex" or "text".
+before_hooks = []
+after_hooks = []
+text_deferrals = []
+
+
+def add_svg_hooks(before=None, after=None):
+    if before is not None:
+        before_hooks.append(before)
+    if after is not None:
+        after_hooks.append(after)
+
+
+def add_text_deferral(defer):
+    text_deferrals.append(defer)
+
+
+def run_before_hooks(kind, svg_file):
+    for hook in before_hooks:
+        if svg_file.exists():
+            return
+        hook(kind, svg_file)
+
+
+def run_after_hooks(kind, svg_file):
+    for hook in after_hooks:
+        hook(kind, svg_file)
+
+
+def compile_tex_svg(tex_file, tex_template):
+    # Only a cache miss needs a working LaTeX installation
+    ensure_latex(tex_template.tex_compiler)
+    # Templates that know how to compile themselves (PrecompiledTexTemplate)
+    # do so
+    compile = getattr(tex_template, "compile", None)
+    if compile is not None:
+        dvi_file = compile(tex_file)
+    else:
+        dvi_file = compile_tex(tex_file, tex_template.tex_compiler, tex_template.output_format)
+    svg_file = convert_to_svg(dvi_file, tex_template.output_format)
+    if not config["no_latex_cleanup"]:
+        delete_nonsvg_files()
+    return svg_file
+
+
+def tex_to_svg_file(expression, environment=None, tex_template=None):
+    # manim's tex_to_svg_file with the hooks around the compile
+    if tex_template is None:
+        tex_template = config["tex_template"]
+    tex_file = generate_tex_file(expression, environment, tex_template)
+    svg_file = tex_file.with_suffix(".svg")
+    if not svg_file.exists():
+        run_before_hooks("tex", svg_file)
+    if not svg_file.exists():
+        compile_tex_svg(tex_file, tex_template)
+    run_after_hooks("tex", svg_file)
+    return svg_file
+
+
+original_text2svg = Text._text2svg
+
+
+def text_svg_file(text, color):
+    # manim's Text._text2svg with the hooks around Pango, which it skips
+    # itself when the SVG exists
+    svg_file = config.get_dir("text_dir") / (text._text2hash(color) + ".svg")
+    if not svg_file.exists():
+        run_before_hooks("text", svg_file)
+    result = original_text2svg(text, color)
+    run_after_hooks("text", svg_file)
+    return result
+
+
+def text2svg(self, color):
+    for defer in text_deferrals:
+        result = defer(self, color)
+        if result is not None:
+            return result
+    return text_svg_file(self, color)
+
+
+# Tex/MathTex look tex_to_svg_file up in their own module. Installed on
+# import, so worker processes that import any of the caches use them too.
+tex_mobject.tex_to_svg_file = tex_to_svg_file
+Text._text2svg = text2svg
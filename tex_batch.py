@@ -0,0 +1,297 @@
+from manim import *
+from manim.constants import START_X, START_Y, TEXT2SVG_ADJUSTMENT_FACTOR
+from manim.mobject.text import tex_mobject
+from manim.utils.tex_file_writing import (
+    compile_tex,
+    delete_nonsvg_files,
+    generate_tex_file,
+    tex_hash,
+)
+from manim.utils.tex import _texcode_for_environment
+from check_tex_template import ensure_latex
+from asset_store import fetch_asset
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import manimpango
+import os
+import re
+
+# Fewest expressions worth a latex run of their own; smaller prefetches are
+# split over fewer processes
+MIN_BATCH_SIZE = 4
+
+# Config options the prefetch workers need to find the cache directories
+PREFETCH_CONFIG_KEYS = [
+    "media_dir",
+    "tex_dir",
+    "text_dir",
+    "no_latex_cleanup",
+    "ffmpeg_loglevel",
+]
+
+# Stand-in SVG returned while recording, so the scene can still lay itself out
+PLACEHOLDER_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="10pt" height="10pt" viewBox="0 0 10 10">'
+    '<path d="M0 0H10V10H0Z"/></svg>'
+)
+
+
+def placeholder_svg():
+    svg_file = config.get_dir("tex_dir") / "batch_placeholder.svg"
+    if not svg_file.exists():
+        svg_file.parent.mkdir(parents=True, exist_ok=True)
+        svg_file.write_text(PLACEHOLDER_SVG, encoding="utf-8")
+    return svg_file
+
+
+@contextmanager
+def record_tex_requests():
+    # Replace the compile step of Tex/MathTex with one that only writes the
+    # .tex file and remembers every expression whose SVG is not cached yet
+    requests = []
+    original = tex_mobject.tex_to_svg_file
+
+    def record(expression, environment=None, tex_template=None):
+        if tex_template is None:
+            tex_template = config["tex_template"]
+        svg_file = generate_tex_file(expression, environment, tex_template).with_suffix(".svg")
+        if svg_file.exists() or fetch_asset("tex", svg_file):
+            return svg_file
+        requests.append((expression, environment, tex_template))
+        return placeholder_svg()
+
+    tex_mobject.tex_to_svg_file = record
+    try:
+        yield requests
+    finally:
+        tex_mobject.tex_to_svg_file = original
+
+
+@contextmanager
+def record_text_requests():
+    # Replace the Pango step of Text with one that only remembers the
+    # arguments of every text2svg call the Text cache will make: at the size
+    # text_cache lays the Text out at, and only when neither its outlines
+    # nor its SVG are cached yet
+    from text_cache import cached_font_size, laid_out_at, text_cache_file
+
+    requests = []
+    original_text2svg = Text._text2svg
+    original_init_svg_mobject = SVGMobject.init_svg_mobject
+
+    def record_request(text, color):
+        text.text_layout_color = color
+        try:
+            font_size = cached_font_size(text)
+            if text_cache_file(text, font_size).exists():
+                return
+            with laid_out_at(text, font_size):
+                svg_file = config.get_dir("text_dir") / (text._text2hash(color) + ".svg")
+                if svg_file.exists() or fetch_asset("text", svg_file, link=False):
+                    return
+                settings = [
+                    (setting.start, setting.end, setting.font, setting.slant, setting.weight, setting.line_num, setting.color)
+                    for setting in text._text2settings(color)
+                ]
+                requests.append((
+                    settings,
+                    text._font_size / TEXT2SVG_ADJUSTMENT_FACTOR,
+                    text.line_spacing / TEXT2SVG_ADJUSTMENT_FACTOR,
+                    text.disable_ligatures,
+                    str(svg_file.resolve()),
+                    START_X,
+                    START_Y,
+                    config["pixel_width"],
+                    config["pixel_height"],
+                    text.text,
+                ))
+        finally:
+            text.text_layout_color = None
+
+    def record(self, color):
+        # Without ligatures Text splits the SVG per character, which a
+        # placeholder cannot stand in for
+        if self.disable_ligatures or config.renderer != RendererType.CAIRO:
+            return original_text2svg(self, color)
+        # Whether the Text is centered, and so the size it is cached at, is
+        # only known once SVGMobject sets it up
+        self.recorded_layout_color = color
+        return str(placeholder_svg())
+
+    def record_init_svg_mobject(self, use_svg_cache):
+        color = self.__dict__.pop("recorded_layout_color", None)
+        if color is not None:
+            record_request(self, color)
+        return original_init_svg_mobject(self, use_svg_cache)
+
+    Text._text2svg = record
+    SVGMobject.init_svg_mobject = record_init_svg_mobject
+    try:
+        yield requests
+    finally:
+        Text._text2svg = original_text2svg
+        SVGMobject.init_svg_mobject = original_init_svg_mobject
+
+
+def collect_scene_requests(scene_class, **scene_kwargs):
+    # Run construct without rendering anything and return the uncached
+    # (expression, environment, tex_template) Tex requests and Text
+    # requests it made; Tex and Text get placeholders, so nothing is laid out
+    with tempconfig({"dry_run": True, "preview": False}), \
+            record_tex_requests() as tex_requests, record_text_requests() as text_requests:
+        scene = scene_class(skip_animations=True, **scene_kwargs)
+        scene.render()
+    return tex_requests, text_requests
+
+
+def batch_document(tex_template, pages):
+    # One standalone document with every expression on its own page
+    documentclass, count = re.subn(
+        r"\\documentclass\[([^\]]*)\]\{standalone\}",
+        lambda match: r"\documentclass[" + match.group(1) + r",multi]{standalone}",
+        tex_template.documentclass,
+    )
+    if count != 1 or tex_template._body:
+        return None
+    template = tex_template.copy()
+    template.documentclass = documentclass
+    return template.get_texcode_for_expression(
+        "\n".join(r"\begin{standalone}" + "\n" + page + "\n" + r"\end{standalone}" for page in pages)
+    )
+
+
+def page_code(expression, environment):
+    # Same wrapping as TexTemplate.get_texcode_for_expression_in_env
+    if environment is None:
+        return expression
+    begin, end = _texcode_for_environment(environment)
+    return "\n".join([begin, expression, end])
+
+
+def compile_tex_batch(requests, cleanup=True):
+    # Compile all requests that share a template in a single latex run and
+    # split the pages with a single dvisvgm run into the per-hash SVG files
+    # that tex_to_svg_file looks up. Returns the requests that still miss.
+    # Batches running side by side leave the cleanup to the caller, which
+    # would otherwise delete each other's .tex and .dvi files.
+    by_template = {}
+    for expression, environment, tex_template in requests:
+        key = (tex_template.tex_compiler, tex_template.output_format, tex_template.body)
+        by_template.setdefault(key, (tex_template, {}))
+        svg_file = generate_tex_file(expression, environment, tex_template).with_suffix(".svg")
+        by_template[key][1].setdefault(svg_file, (expression, environment))
+
+    missing = []
+    for tex_template, entries in by_template.values():
+        entries = {svg: entry for svg, entry in entries.items() if not svg.exists()}
+        if not entries:
+            continue
+        svg_files = list(entries)
+        pages = [page_code(*entries[svg]) for svg in svg_files]
+        document = batch_document(tex_template, pages)
+        if document is None:
+            missing += [(*entries[svg], tex_template) for svg in svg_files]
+            continue
+
+        tex_dir = config.get_dir("tex_dir")
+        tex_file = tex_dir / f"batch_{tex_hash(document)}.tex"
+        tex_file.write_text(document, encoding="utf-8")
+        logger.info(f"Compiling {len(pages)} expressions in one document {tex_file}")
+        try:
+            ensure_latex(tex_template.tex_compiler)
+            dvi_file = compile_tex(tex_file, tex_template.tex_compiler, tex_template.output_format)
+        except ValueError:
+            # Let the per-expression path report which expression is broken
+            missing += [(*entries[svg], tex_template) for svg in svg_files]
+            continue
+
+        page_files = split_pages(dvi_file, tex_template.output_format)
+        if len(page_files) != len(svg_files):
+            logger.warning(
+                f"Expected {len(svg_files)} pages from {dvi_file}, got {len(page_files)}"
+            )
+            for page_file in page_files:
+                page_file.unlink()
+            missing += [(*entries[svg], tex_template) for svg in svg_files]
+            continue
+        for page_file, svg_file in zip(page_files, svg_files):
+            os.replace(page_file, svg_file)
+        tex_file.unlink()
+
+    if cleanup and not config["no_latex_cleanup"]:
+        delete_nonsvg_files()
+    return missing
+
+
+def split_pages(dvi_file, extension):
+    # Convert every page at once; dvisvgm replaces %p with the page number
+    commands = [
+        "dvisvgm",
+        "--pdf" if extension == ".pdf" else "",
+        "-p 1-",
+        f'"{dvi_file.as_posix()}"',
+        "-n",
+        "-v 0",
+        "-o " + f'"{dvi_file.with_name(dvi_file.stem + "-%p.svg").as_posix()}"',
+        ">",
+        os.devnull,
+    ]
+    os.system(" ".join(commands))
+    page_files = dvi_file.parent.glob(f"{dvi_file.stem}-*.svg")
+    return sorted(page_files, key=lambda path: int(path.stem.rsplit("-", 1)[1]))
+
+
+def render_text_request(request):
+    # Runs in a prefetch worker: the text2svg call Text._text2svg would make
+    settings, *arguments = request
+    manimpango.text2svg([manimpango.TextSetting(*setting) for setting in settings], *arguments)
+
+
+def apply_config(config_overrides):
+    # Initializer of the prefetch workers
+    for key, value in config_overrides.items():
+        config[key] = value
+
+
+def split_requests(requests, chunks):
+    # One request per SVG, dealt round-robin into at most ``chunks`` batches
+    unique = {}
+    for expression, environment, tex_template in requests:
+        svg_file = generate_tex_file(expression, environment, tex_template).with_suffix(".svg")
+        unique.setdefault(svg_file, (expression, environment, tex_template))
+    requests = list(unique.values())
+    chunks = max(1, min(chunks, len(requests) // MIN_BATCH_SIZE))
+    return [requests[index::chunks] for index in range(chunks)]
+
+
+def prefetch_scene_tex(scene_class, jobs=None, **scene_kwargs):
+    # Collect every Tex/MathTex and Text the scene needs, then compile the
+    # Tex cache misses as one batch document per worker and render the Text
+    # misses with Pango, all at once on a process pool. Anything a batch
+    # cannot handle is compiled as usual afterwards.
+    tex_requests, text_requests = collect_scene_requests(scene_class, **scene_kwargs)
+    if not tex_requests and not text_requests:
+        return
+    jobs = jobs or os.cpu_count() or 1
+    batches = split_requests(tex_requests, jobs) if tex_requests else []
+    text_requests = list({request[4]: request for request in text_requests}.values())
+    print(
+        f"Prefetching {sum(map(len, batches))} uncached TeX expressions in {len(batches)} batches "
+        f"and {len(text_requests)} uncached texts with {jobs} workers..."
+    )
+    if tex_requests:
+        # Found once here, so the workers inherit the compiler's PATH
+        ensure_latex(tex_requests[0][2].tex_compiler)
+
+    config_overrides = {key: config[key] for key in PREFETCH_CONFIG_KEYS}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=apply_config, initargs=(config_overrides,)) as executor:
+        text_futures = [executor.submit(render_text_request, request) for request in text_requests]
+        batch_futures = [executor.submit(compile_tex_batch, batch, False) for batch in batches]
+        missing = [request for future in batch_futures for request in future.result()]
+        for future in text_futures:
+            future.result()
+
+    if not config["no_latex_cleanup"]:
+        delete_nonsvg_files()
+    for expression, environment, tex_template in missing:
+        tex_mobject.tex_to_svg_file(expression, environment, tex_template)
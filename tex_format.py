@@ -0,0 +1,139 @@
+from manim import *
+from manim.utils.tex_file_writing import compile_tex, tex_hash
+from check_tex_template import probe_latex
+from dataclasses import dataclass
+import os
+
+# Tex/MathTex compile through svg_hooks, which lets this template compile
+# itself. Imported here so that unpickling one in a worker process installs
+# it as well.
+import svg_hooks  # noqa: F401
+
+# Compilers whose preamble can be dumped into a format with -ini
+FORMAT_COMPILERS = {"latex", "pdflatex"}
+
+BEGIN_DOCUMENT = r"\begin{document}"
+
+
+def compiler_version(tex_compiler):
+    # First line of `<compiler> --version`, part of the format key
+    return probe_latex(tex_compiler)["version"]
+
+
+@dataclass(eq=True)
+class PrecompiledTexTemplate(TexTemplate):
+    """A TexTemplate whose preamble is dumped once into a precompiled .fmt file.
+
+    Every expression compiled with this template loads the format instead of
+    re-parsing ``\\documentclass`` and the preamble. The format is keyed by
+    the preamble and the compiler version, so it is rebuilt automatically
+    when either changes. If a compile against the format fails, the format
+    is deleted and the expression compiled the usual way, which also reports
+    any error in the expression itself.
+    """
+
+    def split_document(self, tex_code):
+        # The part dumped into the format, and the part compiled against it
+        head, body = tex_code.split(BEGIN_DOCUMENT, 1)
+        return head, BEGIN_DOCUMENT + body
+
+    def format_file(self, head):
+        formats_dir = config.get_dir("media_dir") / "tex_formats"
+        key = tex_hash(self.tex_compiler + compiler_version(self.tex_compiler) + head)
+        return formats_dir / f"{key}.fmt"
+
+    def dump_format(self, head):
+        # Build the .fmt for this preamble unless it already exists. Returns
+        # None if the compiler cannot dump one, so callers fall back to a
+        # normal compile.
+        if self.tex_compiler not in FORMAT_COMPILERS:
+            return None
+        fmt_file = self.format_file(head)
+        if fmt_file.exists():
+            return fmt_file
+
+        fmt_file.parent.mkdir(parents=True, exist_ok=True)
+        # Dump under a per-process name so parallel workers never see a
+        # half-written format
+        jobname = f"{fmt_file.stem}_{os.getpid()}"
+        ini_file = fmt_file.with_name(f"{jobname}.tex")
+        ini_file.write_text(head + "\n\\dump\n", encoding="utf-8")
+        logger.info(f"Dumping {self.tex_compiler} format for the TeX preamble to {fmt_file}")
+        command = [
+            self.tex_compiler,
+            "-ini",
+            "-interaction=batchmode",
+            "-halt-on-error",
+            f'-jobname="{jobname}"',
+            f'-output-directory="{fmt_file.parent.as_posix()}"',
+            f'"&{self.tex_compiler}"',
+            f'"{ini_file.as_posix()}"',
+            ">",
+            os.devnull,
+        ]
+        exit_code = os.system(" ".join(command))
+        dumped = fmt_file.with_name(f"{jobname}.fmt")
+        for suffix in (".tex", ".log"):
+            fmt_file.with_name(jobname + suffix).unlink(missing_ok=True)
+        if exit_code != 0 or not dumped.exists():
+            logger.warning(f"Could not dump a {self.tex_compiler} format, compiling without it")
+            dumped.unlink(missing_ok=True)
+            return None
+        os.replace(dumped, fmt_file)
+        return fmt_file
+
+    def compile(self, tex_file):
+        # Compile a full document generated from this template against the
+        # precompiled preamble, writing <hash>.dvi next to it as usual
+        result = tex_file.with_suffix(self.output_format)
+        if result.exists():
+            return result
+        head, body = self.split_document(tex_file.read_text(encoding="utf-8"))
+        fmt_file = self.dump_format(head)
+        if fmt_file is None:
+            return compile_tex(tex_file, self.tex_compiler, self.output_format)
+
+        body_file = tex_file.with_name(f"{tex_file.stem}_body.tex")
+        command = [
+            self.tex_compiler,
+            f'-fmt="{fmt_file.as_posix()}"',
+            "-interaction=batchmode",
+            f'-output-format="{self.output_format[1:]}"',
+            "-halt-on-error",
+            f'-jobname="{tex_file.stem}"',
+            f'-output-directory="{tex_file.parent.as_posix()}"',
+            f'"{body_file.as_posix()}"',
+            ">",
+            os.devnull,
+        ]
+        try:
+            body_file.write_text(body, encoding="utf-8")
+            exit_code = os.system(" ".join(command))
+        finally:
+            body_file.unlink(missing_ok=True)
+        if exit_code != 0:
+            # A stale or unreadable format, or a compiler without -fmt
+            logger.warning(
+                f"{self.tex_compiler} could not compile {tex_file.name} with the format {fmt_file.name}, "
+                "compiling without it"
+            )
+            fmt_file.unlink(missing_ok=True)
+            result.unlink(missing_ok=True)
+            return compile_tex(tex_file, self.tex_compiler, self.output_format)
+        return result
+
+
+def use_precompiled_preamble():
+    # Make every Tex/MathTex use a precompiled copy of the current template
+    template = config.tex_template
+    if not isinstance(template, PrecompiledTexTemplate):
+        config.tex_template = PrecompiledTexTemplate(
+            tex_compiler=template.tex_compiler,
+            output_format=template.output_format,
+            documentclass=template.documentclass,
+            preamble=template.preamble,
+            placeholder_text=template.placeholder_text,
+            post_doc_commands=template.post_doc_commands,
+        )
+        config.tex_template.body = template._body
+    return config.tex_template
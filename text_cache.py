@@ -0,0 +1,125 @@
+from manim import *
+from contextlib import contextmanager
+from pathlib import Path
+from svg_cache import can_store, load_svg_arrays, save_svg_arrays
+from tex_batch import placeholder_svg
+import hashlib
+import manimpango
+from manimpango import PangoUtils
+from svg_hooks import add_text_deferral, text_svg_file
+
+# Size centered Text is laid out at; every other size is a uniform scale of
+# these outlines, applied when the Text is built
+REFERENCE_FONT_SIZE = DEFAULT_FONT_SIZE
+
+
+def text_layout_key(text, color, font_size):
+    # Everything that changes what Pango lays out for this Text at
+    # ``font_size``, plus the versions of Pango and its bindings. Line
+    # spacing is stored relative to the size, so it scales along with it.
+    return repr(
+        (
+            type(text).__name__,
+            text.text,
+            text.font,
+            text.slant,
+            text.weight,
+            round(text.line_spacing / text._font_size, 9),
+            font_size,
+            text.disable_ligatures,
+            str(color),
+            sorted(text.t2c.items()),
+            sorted(text.t2f.items()),
+            sorted(text.t2s.items()),
+            sorted(text.t2w.items()),
+            sorted((word, repr(gradient)) for word, gradient in text.t2g.items()),
+            repr(text.gradient),
+            manimpango.__version__,
+            manimpango.pango_version(),
+        )
+    )
+
+
+def text_cache_file(text, font_size):
+    # The layout key plus the arguments that change how the SVG is parsed
+    digest = hashlib.sha256(text_layout_key(text, text.text_layout_color, font_size).encode())
+    digest.update(repr((text.svg_default, text.path_string_config)).encode())
+    cache_dir = Path(config.get_dir("media_dir")) / "text_cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / f"{digest.hexdigest()[:32]}.npz"
+
+
+def defer_text_layout(text, color):
+    # Text has set every layout input by the time it asks for its SVG. Pango
+    # is put off until init_svg_mobject knows whether the outlines are
+    # cached; until then a placeholder stands in for the SVG file. A warm
+    # Text thereby skips the asset store and cache index hooks as well.
+    if config.renderer != RendererType.CAIRO:
+        return None
+    text.text_layout_color = color
+    return str(placeholder_svg())
+
+
+def cached_font_size(text):
+    # Size the outlines of ``text`` are laid out and cached at
+    return REFERENCE_FONT_SIZE if text.should_center else text._font_size
+
+
+@contextmanager
+def laid_out_at(text, font_size):
+    # ``text`` with its size, and its line spacing along with it, set to
+    # ``font_size`` for the duration
+    own_size, own_spacing = text._font_size, text.line_spacing
+    text._font_size = float(font_size)
+    text.line_spacing = own_spacing * font_size / own_size
+    try:
+        yield text
+    finally:
+        text._font_size, text.line_spacing = own_size, own_spacing
+
+
+def layout_text_svg(text, font_size):
+    # Pango's SVG of ``text`` laid out at ``font_size`` instead of its own
+    with laid_out_at(text, font_size):
+        return Path(text_svg_file(text, text.text_layout_color))
+
+
+wrapped_init_svg_mobject = SVGMobject.init_svg_mobject
+
+
+def init_svg_mobject(self, use_svg_cache):
+    # Text outlines are stored by layout key rather than by SVG content, so
+    # a warm Text neither runs Pango nor parses SVG. A centered Text is laid
+    # out at the reference size and scaled, so all its sizes share one
+    # entry; Pango places the text at a fixed offset, which only the
+    # centering makes irrelevant.
+    if getattr(self, "text_layout_color", None) is None:
+        return wrapped_init_svg_mobject(self, use_svg_cache)
+
+    font_size = cached_font_size(self)
+    cache_file = text_cache_file(self, font_size)
+    submobjects = None
+    if cache_file.exists():
+        try:
+            submobjects = load_svg_arrays(cache_file)
+        except Exception as error:
+            logger.warning(f"Ignoring unreadable Text cache file {cache_file}: {error}")
+    if submobjects is None:
+        self.file_name = layout_text_svg(self, font_size)
+        PangoUtils.remove_last_M(self.file_name)
+        wrapped_init_svg_mobject(self, use_svg_cache)
+        if not can_store(self.submobjects):
+            self.scale(self._font_size / font_size, about_point=ORIGIN)
+            return
+        save_svg_arrays(cache_file, self.submobjects)
+        # Continue with what a warm run would load, as svg_cache does
+        submobjects = load_svg_arrays(cache_file)
+        self.remove(*self.submobjects)
+    self.add(*submobjects)
+    self.scale(self._font_size / font_size, about_point=ORIGIN)
+
+
+# Installed on import, like the other hooks, so worker processes that
+# import this module use the cache as well
+add_text_deferral(defer_text_layout)
+SVGMobject.init_svg_mobject = init_svg_mobject
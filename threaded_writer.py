@@ -0,0 +1,120 @@
+from manim import *
+import numpy as np
+import queue
+import threading
+import time
+
+
+class ThreadedFrameWriter:
+    """File writer mixin that encodes frames on a background thread.
+
+    ``write_frame`` copies each frame into one of ``queue_depth``
+    preallocated buffers and returns, while a writer thread hands the filled
+    buffers to the wrapped file writer (ffmpeg pipe or PyAV). Rasterizing the
+    next frame and encoding the previous ones then overlap; when every
+    buffer is in flight the renderer blocks until one is free again.
+
+    ``render_stall_time`` is how long the renderer waited for a free buffer
+    (encoding is the bottleneck), ``encode_stall_time`` how long the writer
+    thread waited for a frame while a movie was open (rasterizing is).
+    """
+
+    queue_depth = 8
+
+    def start_writer_thread(self, frame):
+        self.frame_buffers = np.empty((self.queue_depth, *frame.shape), dtype=frame.dtype)
+        self.free_buffers = queue.Queue()
+        for index in range(self.queue_depth):
+            self.free_buffers.put(index)
+        self.filled_buffers = queue.Queue()
+        self.writer_error = None
+        self.render_stall_time = 0.0
+        self.encode_stall_time = 0.0
+        self.movie_opened_at = time.perf_counter()
+        self.writer_thread = threading.Thread(target=self.drain_frames, daemon=True)
+        self.writer_thread.start()
+
+    def drain_frames(self):
+        while True:
+            start = time.perf_counter()
+            index = self.filled_buffers.get()
+            if index is None:
+                self.filled_buffers.task_done()
+                return
+            # Only count waiting while a movie is open, not the gaps between plays
+            self.encode_stall_time += max(
+                0.0, time.perf_counter() - max(start, self.movie_opened_at)
+            )
+            try:
+                # After an error keep recycling buffers so the renderer
+                # never deadlocks; the error is raised on its side
+                if self.writer_error is None:
+                    super().write_frame(self.frame_buffers[index])
+            except Exception as error:
+                self.writer_error = error
+            finally:
+                self.free_buffers.put(index)
+                self.filled_buffers.task_done()
+
+    def raise_writer_error(self):
+        if getattr(self, "writer_error", None) is not None:
+            error, self.writer_error = self.writer_error, None
+            raise error
+
+    def write_frame(self, frame_or_renderer):
+        if not isinstance(frame_or_renderer, np.ndarray):
+            # OpenGL hands over the renderer itself, keep that synchronous
+            return super().write_frame(frame_or_renderer)
+        if getattr(self, "writer_thread", None) is None:
+            self.start_writer_thread(frame_or_renderer)
+        self.raise_writer_error()
+
+        start = time.perf_counter()
+        index = self.free_buffers.get()
+        self.render_stall_time += time.perf_counter() - start
+        np.copyto(self.frame_buffers[index], frame_or_renderer)
+        self.filled_buffers.put(index)
+
+    def wait_for_frames(self):
+        # Block until every queued frame has been handed to the encoder
+        if getattr(self, "writer_thread", None) is not None:
+            self.filled_buffers.join()
+        self.raise_writer_error()
+
+    def open_movie_pipe(self, file_path=None):
+        super().open_movie_pipe(file_path=file_path)
+        self.movie_opened_at = time.perf_counter()
+
+    def close_movie_pipe(self):
+        self.wait_for_frames()
+        super().close_movie_pipe()
+
+    def stop_writer_thread(self):
+        if getattr(self, "writer_thread", None) is None:
+            return
+        self.wait_for_frames()
+        self.filled_buffers.put(None)
+        self.writer_thread.join()
+        self.writer_thread = None
+        logger.info(
+            f"Frame writer: renderer stalled {self.render_stall_time:.2f}s waiting for free buffers, "
+            f"encoder stalled {self.encode_stall_time:.2f}s waiting for frames "
+            f"(queue depth {self.queue_depth})"
+        )
+
+    def finish(self):
+        self.stop_writer_thread()
+        super().finish()
+
+
+class PipelinedCairoRenderer(CairoRenderer):
+    """CairoRenderer that hands the camera's pixel buffer straight to the file writer.
+
+    The threaded writer copies every frame into its own buffer pool (and the
+    ffmpeg pipe consumes it synchronously), so the extra ``np.array`` copy
+    in ``get_frame`` is not needed for animated frames.
+    """
+
+    def render(self, scene, time, moving_mobjects):
+        self.update_frame(scene, moving_mobjects)
+        self.add_frame(self.camera.pixel_array)